@@ -6,30 +6,40 @@ docstrings are used throughout.
 """
 
 import datetime
+import functools
 
 import os
 import sys
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
-import pytz
-from typing import Type, Tuple, Optional, Literal, ClassVar
+from typing import Any, Dict, Type, Tuple, Optional, Literal, ClassVar
 
+import yaml
 from loguru import logger
 
 import Helper
 
-_CONFIGDIRPATH: Path = Path(__file__).parent.resolve()
-_CONFIGDIRPATH = Path(os.getenv("MQTTCOMMANDER_CONFIG_DIR_PATH")) if os.getenv("MQTTCOMMANDER_CONFIG_DIR_PATH") else _CONFIGDIRPATH  # type: ignore
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml -> pure-python loader
+    from yaml import SafeLoader as _YamlSafeLoader  # type: ignore[assignment]
 
-_CONFIGPATH: Path = Path(_CONFIGDIRPATH, "config.yaml")
-_CONFIGPATH = Path(os.getenv("MQTTCOMMANDER_CONFIG_PATH")) if os.getenv("MQTTCOMMANDER_CONFIG_PATH") else _CONFIGPATH  # type: ignore
+# each env override is read once; defaults (incl. the resolve() stat) are only built when no override is set
+_env_configdirpath: Optional[str] = os.environ.get("MQTTCOMMANDER_CONFIG_DIR_PATH")
+_CONFIGDIRPATH: Path = Path(_env_configdirpath) if _env_configdirpath else Path(__file__).parent.resolve()
 
-_CONFIGLOCALPATH: Path = Path(_CONFIGDIRPATH, "config.local.yaml")
-_CONFIGLOCALPATH = Path(os.getenv("MQTTCOMMANDER_CONFIG_LOCAL_PATH")) if os.getenv("MQTTCOMMANDER_CONFIG_LOCAL_PATH") else _CONFIGLOCALPATH  # type: ignore
+_env_configpath: Optional[str] = os.environ.get("MQTTCOMMANDER_CONFIG_PATH")
+_CONFIGPATH: Path = Path(_env_configpath) if _env_configpath else Path(_CONFIGDIRPATH, "config.yaml")
 
-TZBERLIN: datetime.tzinfo = pytz.timezone("Europe/Berlin")
+_env_configlocalpath: Optional[str] = os.environ.get("MQTTCOMMANDER_CONFIG_LOCAL_PATH")
+_CONFIGLOCALPATH: Path = (
+    Path(_env_configlocalpath) if _env_configlocalpath else Path(_CONFIGDIRPATH, "config.local.yaml")
+)
+
+TZBERLIN: datetime.tzinfo = ZoneInfo("Europe/Berlin")
 
-from pydantic import BaseModel, Field, AliasPath, AliasChoices, field_validator
+from pydantic import BaseModel, ConfigDict, Field, AliasPath, AliasChoices, field_validator
 from pydantic.fields import FieldInfo
 
 from pydantic_settings import (
@@ -117,6 +127,8 @@ from pydantic_settings import (
 class Redis(BaseModel):
     """Redis connection configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     host: str = Field(default="127.0.0.1")
     host_in_cluster: Optional[str] = Field(default=None)
     port: int = Field(default=6379)
@@ -125,6 +137,8 @@ class Redis(BaseModel):
 class Mqtt(BaseModel):
     """MQTT broker credentials and connection details."""
 
+    model_config = ConfigDict(frozen=True)
+
     host: str = Field(default="127.0.0.1")
     port: int = Field(default=1883)
     username: str = Field()
@@ -193,6 +207,22 @@ class Mqtt(BaseModel):
 #         )
 
 
+class CYamlConfigSettingsSource(YamlConfigSettingsSource):
+    """YAML settings source that parses with libyaml's C loader if available."""
+
+    def _read_file(self, file_path: Path) -> Dict[str, Any]:  # type: ignore[override]
+        """Read and parse a single YAML file.
+
+        Args:
+            file_path: Path of the YAML file.
+
+        Returns:
+            dict[str, Any]: Parsed content, empty dict for an empty file.
+        """
+        with file_path.open(encoding=self.yaml_file_encoding) as yaml_file:
+            return yaml.load(yaml_file, Loader=_YamlSafeLoader) or {}
+
+
 class Settings(BaseSettings):
     """Application settings loaded from YAML and environment variables.
 
@@ -243,11 +273,40 @@ class Settings(BaseSettings):
             tuple[PydanticBaseSettingsSource, ...]: Ordered sources to use.
         """
         # return init_settings, MyEnvSettingsSource.from_other(env_settings), YamlConfigSettingsSource(settings_cls)
-        return init_settings, env_settings, YamlConfigSettingsSource(settings_cls)
+        return init_settings, env_settings, CYamlConfigSettingsSource(settings_cls)
+
+
+@functools.cache
+def get_settings() -> Settings:
+    """Return the application settings, loading them on first use.
+
+    Reading the YAML files and validating them is deferred until the settings
+    are actually needed and done only once per process.
+
+    Returns:
+        Settings: The cached settings instance.
+    """
+    return Settings()  # type: ignore # Settings(settings_in_yaml_not=8888)
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily provide the legacy module attribute ``settings``.
+
+    Args:
+        name: Requested module attribute.
+
+    Returns:
+        Any: The cached :class:`Settings` instance for ``settings``.
+
+    Raises:
+        AttributeError: For any other unknown attribute.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-settings: Settings = Settings()  # type: ignore # Settings(settings_in_yaml_not=8888)
-# pprint(settings.model_dump(), indent_guides=False, expand_all=True)
+# pprint(get_settings().model_dump(), indent_guides=False, expand_all=True)
 
 if __name__ == "__main__":
-    logger.info(Helper.get_pretty_dict_json_no_sort(settings.model_dump(mode="json", by_alias=True)))
+    logger.info(Helper.get_pretty_dict_json_no_sort(get_settings().model_dump(mode="json", by_alias=True)))
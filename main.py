@@ -3,7 +3,9 @@
 Loads settings from config and invokes the CLI.
 """
 
+import functools
 import sys
+from typing import Tuple
 
 from loguru import logger
 
@@ -13,22 +15,22 @@ from mqttcommander import cli
 mqttcommander.configure_loguru_default_with_skiplog_filter()
 logger.enable("mqttcommander")
 
-from config import settings
+from config import get_settings
+
+
+@functools.cache
+def _mqtt_argv() -> Tuple[str, ...]:
+    """Return the MQTT connection settings in argv format for :func:`cli.main`.
+
+    Returns:
+        tuple[str, ...]: ``--host``/``--port``/``--username``/``--password`` arguments.
+    """
+    s = get_settings().mqtt
+    return "--host", s.host, "--port", str(s.port), "--username", s.username, "--password", s.password
+
 
 if __name__ == "__main__":
     # cli.main()
 
-    # Settings in argv-Format konvertieren
-    mqtt_args = [
-        "--host",
-        settings.mqtt.host,
-        "--port",
-        str(settings.mqtt.port),
-        "--username",
-        settings.mqtt.username,
-        "--password",
-        settings.mqtt.password,
-    ]
-
     # remaining argv are just passed in...
-    cli.main(mqtt_args + sys.argv[1:])
+    cli.main(list(_mqtt_argv()) + sys.argv[1:])
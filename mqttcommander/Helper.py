@@ -1,49 +1,142 @@
 """Helper utilities for JSON pretty printing and complex encoding.
 
 This module provides convenience functions to pretty print dictionaries and
-serialize complex objects (datetime, UUID, timedelta, etc.) to JSON.
+serialize complex objects (datetime, UUID, timedelta, etc.) to JSON, a deep
+update for dict/list structures, and utilities for formatting exceptions and
+inspecting loguru handlers.
 """
 
 import json
+import re
+import traceback
 from datetime import datetime, date, timedelta
-from typing import Any
+from typing import Any, Callable, Dict, List, Tuple
 from uuid import UUID
 
+import orjson
 
-def print_pretty_dict_json(data: Any, indent: int = 4) -> None:
+_TASMOTA_VERSION_RE: re.Pattern[str] = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+
+# container types merged by update_deep; exact-type membership on purpose (JSON-like data, no subclasses)
+_CONTAINERS: tuple[type, ...] = (dict, list)
+
+# loguru level number -> name, built on first use by get_loguru_logger_info
+_LOGURU_LEVEL_NAMES: Dict[int, str] | None = None
+
+
+def _loguru_level_name(logger: Any, levelno: int) -> str:
+    """Return the loguru level name for ``levelno`` from a lazily built lookup.
+
+    The lookup is rebuilt if a level was registered after it had been created.
+
+    Args:
+        logger: The loguru logger.
+        levelno: Numeric level of a handler.
+
+    Returns:
+        str: Level name.
+    """
+    global _LOGURU_LEVEL_NAMES
+
+    if _LOGURU_LEVEL_NAMES is None or levelno not in _LOGURU_LEVEL_NAMES:
+        _LOGURU_LEVEL_NAMES = {lvv.no: lvv.name for lvv in logger._core.levels.values()}
+
+    return _LOGURU_LEVEL_NAMES[levelno]
+
+
+def get_loguru_logger_info() -> None:
+    """Inspect and log loguru handlers and filters for debugging."""
+    # deferred import
+    from loguru import logger
+
+    def inspect_loggers() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return descriptions of all configured loguru handlers and their filters in a single pass."""
+        handlers_info: List[Dict[str, Any]] = []
+        filters: List[Dict[str, Any]] = []
+
+        for handler_id, handler in logger._core.handlers.items():  # type: ignore
+            filter_func = handler._filter
+            filter_name: str = filter_func.__name__ if callable(filter_func) else str(filter_func)
+
+            handlers_info.append(
+                {
+                    "id": handler_id,
+                    "level": handler._levelno,
+                    "level_name": _loguru_level_name(logger, handler._levelno),  # handler._level_name,
+                    "format": handler._formatter,
+                    "sink": str(handler._sink),
+                    "filter": filter_name,
+                    "colorize": getattr(handler, "_colorize", None),
+                    "serialize": getattr(handler, "_serialize", None),
+                }
+            )
+
+            if filter_func is not None:
+                filters.append({"handler_id": handler_id, "filter": filter_func, "filter_name": filter_name})
+
+        return handlers_info, filters
+
+    handlers_info, filters = inspect_loggers()
+
+    for handler in handlers_info:
+        logger.info(f"Handler {handler['id']}:")
+        logger.info(f"  Level: {handler['level_name']} ({handler['level']})")
+        logger.info(f"  Format: {handler['format']}")
+        logger.info(f"  Sink: {handler['sink']}")
+        logger.info(f"  Filter: {handler['filter']}")
+        logger.info("")
+
+    # only filters:
+    for f in filters:
+        logger.info(f"Handler {f['handler_id']}: {f['filter_name']}")
+
+
+def print_pretty_dict_json(data: Any, indent: int = 2) -> None:
     """Print a dictionary as pretty-formatted JSON.
 
     Args:
         data: Any JSON-serializable data structure.
-        indent: Indentation level for formatting.
+        indent: Indentation level for formatting; only 2 is served by ``orjson``, other values fall back
+            to stdlib ``json``.
     """
-    print(json.dumps(data, indent=indent, sort_keys=True, cls=ComplexEncoder, default=str))
+    print(_dumps(data, indent=indent, sort_keys=True))
 
 
-def get_pretty_dict_json(data: Any, indent: int = 4) -> str:
+def get_pretty_dict_json(data: Any, indent: int = 2) -> str:
     """Return a pretty-formatted JSON string with keys sorted.
 
     Args:
         data: Any JSON-serializable data structure.
-        indent: Indentation level for formatting.
+        indent: Indentation level for formatting; only 2 is served by ``orjson``, other values fall back
+            to stdlib ``json``.
 
     Returns:
         str: JSON string.
     """
-    return json.dumps(data, indent=indent, sort_keys=True, cls=ComplexEncoder, default=str)
+    return _dumps(data, indent=indent, sort_keys=True)
 
 
-def get_pretty_dict_json_no_sort(data: Any, indent: int = 4) -> str:
+def get_pretty_dict_json_no_sort(data: Any, indent: int = 2) -> str:
     """Return a pretty-formatted JSON string without sorting keys.
 
     Args:
         data: Any JSON-serializable data structure.
-        indent: Indentation level for formatting.
+        indent: Indentation level for formatting; only 2 is served by ``orjson``, other values fall back
+            to stdlib ``json``.
 
     Returns:
         str: JSON string.
     """
-    return json.dumps(data, indent=indent, sort_keys=False, cls=ComplexEncoder, default=str)
+    return _dumps(data, indent=indent, sort_keys=False)
+
+
+# exact-type lookup for ComplexEncoder.default; order matters for the isinstance fallback (datetime is a date)
+_COMPLEX_ENCODER_DISPATCH: Dict[type, Callable[[Any], Any]] = {
+    datetime: lambda o: o.isoformat(),  # strftime("%Y-%m-%d %H:%M:%S %Z")
+    date: lambda o: o.isoformat(),
+    timedelta: str,
+    UUID: str,
+}
 
 
 class ComplexEncoder(json.JSONEncoder):
@@ -58,23 +151,84 @@ class ComplexEncoder(json.JSONEncoder):
         Returns:
             Any: JSON-serializable representation.
         """
-        if hasattr(obj, "repr_json"):
-            return obj.repr_json()
-        elif hasattr(obj, "as_string"):
-            return obj.as_string()
-        elif isinstance(obj, UUID):
-            return str(obj)
-        elif isinstance(obj, datetime):
-            return obj.isoformat()  # strftime("%Y-%m-%d %H:%M:%S %Z")
-        elif isinstance(obj, date):
-            return obj.strftime("%Y-%m-%d")
-        elif isinstance(obj, timedelta):
-            return str(obj)
-        elif isinstance(obj, dict) or isinstance(obj, list):
-            robj: str = get_pretty_dict_json_no_sort(obj)
-            return robj
-        else:
-            return json.JSONEncoder.default(self, obj)
+        fn: Callable[[Any], Any] | None = _COMPLEX_ENCODER_DISPATCH.get(type(obj))
+        if fn is not None:
+            return fn(obj)
+
+        repr_json: Callable[[], Any] | None = getattr(obj, "repr_json", None)
+        if repr_json is not None:
+            return repr_json()
+
+        as_string: Callable[[], Any] | None = getattr(obj, "as_string", None)
+        if as_string is not None:
+            return as_string()
+
+        # subclasses of the dispatched types (e.g. tz-aware datetime implementations)
+        for t, fn in _COMPLEX_ENCODER_DISPATCH.items():
+            if isinstance(obj, t):
+                return fn(obj)
+
+        return json.JSONEncoder.default(self, obj)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize objects ``orjson`` does not handle natively.
+
+    Mirrors :meth:`ComplexEncoder.default`; UUID and datetime/date values are
+    encoded natively by ``orjson`` and never reach this function.
+
+    Args:
+        obj: Object to serialize.
+
+    Returns:
+        Any: JSON-serializable representation.
+    """
+    repr_json: Callable[[], Any] | None = getattr(obj, "repr_json", None)
+    if repr_json is not None:
+        return repr_json()
+
+    as_string: Callable[[], Any] | None = getattr(obj, "as_string", None)
+    if as_string is not None:
+        return as_string()
+
+    # same catch-all as the former ``default=str`` of the json.dumps calls (timedelta, IPv4Address, HttpUrl, ...)
+    return str(obj)
+
+
+def _dumps(data: Any, indent: int, sort_keys: bool) -> str:
+    """Serialize ``data`` to an indented JSON string.
+
+    Args:
+        data: Any JSON-serializable structure.
+        indent: Indentation to use; ``orjson`` only supports 2.
+        sort_keys: Whether to sort dictionary keys.
+
+    Returns:
+        str: JSON string.
+    """
+    if indent != 2:
+        return json.dumps(data, indent=indent, sort_keys=sort_keys, cls=ComplexEncoder, default=str)
+
+    option: int = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+
+    return orjson.dumps(data, default=_orjson_default, option=option).decode()
+
+
+def _parse_tasmota_version(v: str) -> tuple[int, int, int]:
+    """Extract the major.minor.patch part from a version string.
+
+    Args:
+        v: Version string.
+
+    Returns:
+        tuple[int, int, int]: (major, minor, patch) or (0, 0, 0) if no match.
+    """
+    m: re.Match[str] | None = _TASMOTA_VERSION_RE.match(v)
+    if m:
+        return int(m[1]), int(m[2]), int(m[3])
+    return 0, 0, 0
 
 
 def compare_tasmota_versions(v1: str, v2: str) -> int:
@@ -87,29 +241,71 @@ def compare_tasmota_versions(v1: str, v2: str) -> int:
     Returns:
         int: -1 if v1 < v2, 0 if v1 == v2, 1 if v1 > v2.
     """
-    import re
+    p1: tuple[int, int, int] = _parse_tasmota_version(v1)
+    p2: tuple[int, int, int] = _parse_tasmota_version(v2)
 
-    def parse_version(v: str) -> list[int]:
-        """Extract the major.minor.patch part from a version string.
+    return (p1 > p2) - (p1 < p2)
 
-        Args:
-            v: Version string.
 
-        Returns:
-            list[int]: [major, minor, patch] or [0, 0, 0] if no match.
-        """
-        # Extract the major.minor.patch part
-        match = re.match(r"(\d+)\.(\d+)\.(\d+)", v)
-        if match:
-            return [int(x) for x in match.groups()]
-        return [0, 0, 0]
-
-    parts1 = parse_version(v1)
-    parts2 = parse_version(v2)
-
-    for p1, p2 in zip(parts1, parts2):
-        if p1 < p2:
-            return -1
-        if p1 > p2:
-            return 1
-    return 0
+def update_deep(base: Dict[str, Any] | List[Any], u: Dict[str, Any] | List[Any]) -> Dict[str, Any] | List[Any]:
+    """Return ``base`` recursively merged with ``u`` for dicts and lists.
+
+    Neither argument is mutated. Only the containers along merged paths are
+    copied; untouched subtrees of ``base`` and values taken over from ``u`` are
+    shared with the inputs, so callers do not need a defensive deepcopy.
+
+    Args:
+        base: Base dictionary or list.
+        u: Update structure (dict/list) to merge in.
+
+    Returns:
+        dict | list: The merged structure.
+    """
+    if isinstance(u, dict):
+        out: Dict[str, Any] = dict(base) if isinstance(base, dict) else {}
+
+        # fast path (incl. empty override): flat update without any nested containers
+        if not any(type(v) in _CONTAINERS for v in u.values()):
+            out.update(u)
+            return out
+
+        for k, v in u.items():
+            t = type(v)
+            if t in _CONTAINERS:
+                existing: Any = out.get(k)
+                out[k] = update_deep(existing, v) if type(existing) is t else v
+            else:
+                out[k] = v
+
+        return out
+
+    elif isinstance(u, list):
+        # a non-list base is discarded on mismatch!!! - result always has the length of u
+        base_list: List[Any] = base if isinstance(base, list) else []
+        n_base: int = len(base_list)
+
+        return [
+            (
+                update_deep(base_list[i], v)
+                if i < n_base and type(v) in _CONTAINERS and type(base_list[i]) is type(v)
+                else v
+            )
+            for i, v in enumerate(u)
+        ]
+
+    return base
+
+
+def get_exception_tb_as_string(exc: Exception) -> str:
+    """Return a full traceback string for an exception.
+
+    Args:
+        exc: Exception instance.
+
+    Returns:
+        str: Multiline traceback string.
+    """
+    tb1: traceback.TracebackException = traceback.TracebackException.from_exception(exc)
+
+    # leading newline keeps the previous output shape ("\n" before every formatted chunk)
+    return "\n" + "\n".join(tb1.format())
@@ -6,9 +6,10 @@ discovery, configuration updates, and firmware management.
 
 __version__ = "0.0.4"
 
+import importlib
 import os
 import sys
-from typing import Callable, Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any
 
 from loguru import logger as glogger
 
@@ -74,22 +75,67 @@ def configure_loguru_default_with_skiplog_filter(
     glogger.configure(extra={"classname": "None", "skiplog": False})
 
 
-from .tasmotacommander import (
-    MqttCommander,
-    read_tasmotas_from_latest_file,
-    write_tasmota_devices_file,
-    TASMOTA_DEFAULT_TOPICS,
-    TASMOTA_DISCOVERY_TOPIC_BEGIN,
-    TASMOTA_LWT_TOPIC_BEGIN,
-    TASMOTA_LWT_TOPIC_END,
-)
-
-from .models import (
-    TasmotaDevice,
-    TasmotaDeviceConfig,
-    TasmotaDeviceSensors,
-    TasmotaTimerConfig,
-    TasmotaTimezoneConfig,
-    TasmotaRule,
-    TasmotaTimeZoneDSTSTD,
-)
+# the submodules pull in paho-mqtt, pydantic and requests - resolve the public names lazily on first access
+# so that e.g. ``mqttcommander --help`` does not pay for them
+_LAZY_ATTRS: Dict[str, str] = {
+    "MqttCommander": "tasmotacommander",
+    "read_tasmotas_from_latest_file": "tasmotacommander",
+    "write_tasmota_devices_file": "tasmotacommander",
+    "TASMOTA_DEFAULT_TOPICS": "tasmotacommander",
+    "TASMOTA_DISCOVERY_TOPIC_BEGIN": "tasmotacommander",
+    "TASMOTA_LWT_TOPIC_BEGIN": "tasmotacommander",
+    "TASMOTA_LWT_TOPIC_END": "tasmotacommander",
+    "TasmotaDevice": "models",
+    "TasmotaDeviceConfig": "models",
+    "TasmotaDeviceSensors": "models",
+    "TasmotaTimerConfig": "models",
+    "TasmotaTimezoneConfig": "models",
+    "TasmotaRule": "models",
+    "TasmotaTimeZoneDSTSTD": "models",
+    "parse_sensors": "models",
+}
+
+__all__ = ["configure_loguru_default_with_skiplog_filter", *_LAZY_ATTRS]
+
+if TYPE_CHECKING:
+    from .tasmotacommander import (
+        MqttCommander,
+        read_tasmotas_from_latest_file,
+        write_tasmota_devices_file,
+        TASMOTA_DEFAULT_TOPICS,
+        TASMOTA_DISCOVERY_TOPIC_BEGIN,
+        TASMOTA_LWT_TOPIC_BEGIN,
+        TASMOTA_LWT_TOPIC_END,
+    )
+
+    from .models import (
+        TasmotaDevice,
+        TasmotaDeviceConfig,
+        TasmotaDeviceSensors,
+        TasmotaTimerConfig,
+        TasmotaTimezoneConfig,
+        TasmotaRule,
+        TasmotaTimeZoneDSTSTD,
+        parse_sensors,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule providing ``name`` on first access and cache the attribute.
+
+    Args:
+        name: Attribute name looked up on the package.
+
+    Returns:
+        Any: The requested attribute.
+
+    Raises:
+        AttributeError: If ``name`` is not a lazily provided attribute.
+    """
+    submodule: str | None = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value: Any = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
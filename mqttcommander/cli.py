@@ -4,21 +4,243 @@ Provides a small set of subcommands to inspect retained messages, list
 discovered Tasmota devices, and send commands to online devices.
 """
 
+import argparse
+import functools
 import textwrap
+from datetime import tzinfo
 from pathlib import Path
-from typing import Optional, List, cast, Union
+from typing import TYPE_CHECKING, Callable, Dict, Optional, List, Tuple, cast, Union
+from zoneinfo import ZoneInfo
 
-import pytz
 from loguru import logger
 
 import mqttcommander
-from mqttcommander import (
-    MqttCommander,
-    TASMOTA_DEFAULT_TOPICS,
-    read_tasmotas_from_latest_file,
-    TasmotaDevice,
-    Helper,
-)
+
+if TYPE_CHECKING:
+    from mqttcommander import MqttCommander, TasmotaDevice
+
+# stop receiving retained messages once the broker was silent for this long (grace-s stays the hard ceiling)
+_RETAINED_IDLE_TIMEOUT_MS: int = 250
+
+# topic/payload templates of the trigger-lwt-send Publish2 command (bound str.format, built once)
+LWT_TRIGGER_CMND_FMT: Callable[[str], str] = "cmnd/{}/Publish2".format
+LWT_TRIGGER_PAYLOAD_FMT: Callable[[str], str] = "tele/{}/LWT Online".format
+
+
+def _names_and_devices(devs: List["TasmotaDevice"]) -> List[Tuple[Optional[str], "TasmotaDevice"]]:
+    """Pair every device with its display name in a single pass.
+
+    The name is the first set of device name, friendly name and topic of the device's config.
+
+    Args:
+        devs: Devices to name.
+
+    Returns:
+        list[tuple[str | None, TasmotaDevice]]: ``(name, device)`` rows in input order.
+    """
+    rows: List[Tuple[Optional[str], "TasmotaDevice"]] = []
+    for d in devs:
+        tc = d.tasmota_config
+        rows.append((None if tc is None else (tc.device_name or tc.friendly_name or tc.topic), d))
+
+    return rows
+
+
+@functools.cache
+def _tz(name: str) -> tzinfo:
+    """Return the (cached) timezone object for an IANA timezone name.
+
+    Args:
+        name: Timezone name, e.g. ``Europe/Berlin``.
+
+    Returns:
+        tzinfo: The corresponding :class:`zoneinfo.ZoneInfo`.
+    """
+    return ZoneInfo(name)
+
+
+def _retained_grace_ms(opts: argparse.Namespace) -> int:
+    """Return the retained-messages receive window of the action in milliseconds.
+
+    Args:
+        opts: Options of the action.
+
+    Returns:
+        int: ``--grace-s`` in ms, defaulting to 5 seconds.
+    """
+    return (opts.retained_msgs_receive_grace_s or 5) * 1000
+
+
+def _retained_devices(comm: "MqttCommander", opts: argparse.Namespace) -> List["TasmotaDevice"]:
+    """Build the device list from retained data with the action's receive/noise options.
+
+    Args:
+        comm: Connected commander.
+        opts: Options of the action.
+
+    Returns:
+        list[TasmotaDevice]: Devices discovered from retained messages.
+    """
+    return comm.get_all_tasmota_devices_from_retained(
+        noisy=bool(opts.noisy),
+        noisy_lowerlevel=bool(opts.noisy_lowerlevel),
+        retained_msgs_receive_grace_ms=_retained_grace_ms(opts),
+        retained_idle_timeout_ms=_RETAINED_IDLE_TIMEOUT_MS,
+    )
+
+
+def _do_readfromfile(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Load the latest saved Tasmota device snapshot and print the count.
+
+    Args:
+        mk_comm: Factory for the connected commander (unused - no broker needed).
+        opts: Options of the action.
+    """
+    from mqttcommander import read_tasmotas_from_latest_file
+
+    tasmotas = read_tasmotas_from_latest_file(
+        tasmota_json_dir=opts.tasmota_json_dir,
+        timezone=_tz(opts.timezone_name or "Europe/Berlin"),
+    )
+    count = len(tasmotas) if tasmotas else 0
+    logger.info(f"Loaded {count} tasmota devices from latest file")
+
+
+def _do_list_retained_msgs(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Receive and count retained MQTT messages for the default topics.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+    """
+    comm = mk_comm()
+    msgs = comm.get_all_retained_msgs(
+        retained_msgs_receive_grace_ms=_retained_grace_ms(opts),
+        noisy=bool(opts.noisy),
+        retained_idle_timeout_ms=_RETAINED_IDLE_TIMEOUT_MS,
+    )
+    cnt = 0 if msgs is None else len(msgs)
+    logger.info(f"Retained messages matching topics {comm.topics}: {cnt}")
+    if msgs:
+        for m in msgs:
+            logger.info(f"- {m.topic}")
+
+
+def _do_list_tasmotas(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Build the device list from retained discovery messages and print the devices.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+    """
+    from mqttcommander import Helper
+
+    all_devs = _retained_devices(mk_comm(), opts)
+    logger.info(f"Found {len(all_devs)} tasmota devices from retained data")
+    for name, d in _names_and_devices(all_devs):
+        # lazy: the pretty dump is only built if a sink actually accepts INFO
+        logger.opt(lazy=True).info(
+            "- {}\n{}",
+            lambda name=name: name,
+            lambda d=d: textwrap.indent(Helper.get_pretty_dict_json_no_sort(d.model_dump(mode="json")), "\t"),
+        )
+
+
+def _do_list_online(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Filter the online devices from retained data and print them.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+    """
+    from mqttcommander import Helper
+
+    comm = mk_comm()
+    all_devs = _retained_devices(comm, opts)
+    online = comm.filter_online_tasmotas_from_retained(
+        all_tasmotas=all_devs, update_lwt_current_value=True, retained_idle_timeout_ms=_RETAINED_IDLE_TIMEOUT_MS
+    )
+    logger.info(f"Online devices: {len(online)} / {len(all_devs)}")
+    for name, d in _names_and_devices(online):
+        logger.opt(lazy=True).info(
+            "- {} online={}\n{}",
+            lambda name=name: name,
+            lambda d=d: d.lwt_current_value,
+            lambda d=d: textwrap.indent(Helper.get_pretty_dict_json_no_sort(d.model_dump(mode="json")), "\t"),
+        )
+
+
+def _do_send_cmd(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Send a command to all online devices.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+
+    Raises:
+        SystemExit: If no command is given.
+    """
+    if not opts.command:
+        raise SystemExit("--command is required for action send-cmd")
+
+    comm = mk_comm()
+    all_devs = _retained_devices(comm, opts)
+    online = comm.filter_online_tasmotas_from_retained(all_devs, retained_idle_timeout_ms=_RETAINED_IDLE_TIMEOUT_MS)
+    # vals_typed = cast(
+    #     List[List[Union[str, float, dict, int]] | None] | None, [values] if values is not None else None
+    # )
+    val_typed = cast(List[Union[str, float, dict, int]] | None, opts.value if opts.value is not None else None)
+    comm.send_cmds_to_online_tasmotas(
+        online, to_be_used_commands=[opts.command], values_to_send=[val_typed for _ in online]
+    )
+
+
+def _do_upgrade_online(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Upgrade online devices whose OtaUrl offers a newer firmware.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+    """
+    comm = mk_comm()
+    all_devs = _retained_devices(comm, opts)
+    online = comm.filter_online_tasmotas_from_retained(all_devs, retained_idle_timeout_ms=_RETAINED_IDLE_TIMEOUT_MS)
+
+    comm.ensure_freshest_firmware(online_tasmotas=online, dry_run=bool(opts.dry_run))
+
+
+def _do_trigger_lwt_send(mk_comm: Callable[[], "MqttCommander"], opts: argparse.Namespace) -> None:
+    """Trigger LWT Online for all offline devices using the Publish2 command.
+
+    Args:
+        mk_comm: Factory for the connected commander.
+        opts: Options of the action.
+    """
+    comm = mk_comm()
+    all_devs = _retained_devices(comm, opts)
+    pairs = [
+        (LWT_TRIGGER_CMND_FMT(tc.topic), LWT_TRIGGER_PAYLOAD_FMT(tc.topic))
+        for d in all_devs
+        if not d.is_online() and (tc := d.tasmota_config) is not None and tc.topic
+    ]
+    logger.info(f"Triggering LWT Online for {len(pairs)} offline devices")
+
+    if pairs:
+        # this is direct mqtt command-sending mode...
+        for cmd_topic, cmd_payload in pairs:
+            logger.info(f"Sending to {cmd_topic}: {cmd_payload}")
+        comm.publish_many(pairs)
+
+
+ACTIONS: Dict[str, Callable[[Callable[[], "MqttCommander"], argparse.Namespace], None]] = {
+    "readfromfile": _do_readfromfile,
+    "list-retained-msgs": _do_list_retained_msgs,
+    "list-tasmotas": _do_list_tasmotas,
+    "list-online": _do_list_online,
+    "send-cmd": _do_send_cmd,
+    "upgrade-online": _do_upgrade_online,
+    "trigger-lwt-send": _do_trigger_lwt_send,
+}
 
 
 def _run(
@@ -43,12 +265,13 @@ def _run(
         port: MQTT broker port.
         username: MQTT username.
         password: MQTT password.
-        action: Subcommand to execute. One of:
+        action: Subcommand to execute (a key of :data:`ACTIONS`). One of:
             - ``readfromfile``: Load latest saved Tasmota device snapshot and print count.
             - ``list-retained-msgs``: Receive and count retained MQTT messages for default topics.
             - ``list-tasmotas``: Build device list from retained discovery messages and print them.
             - ``list-online``: Filter online devices from retained data and print them.
             - ``send-cmd``: Send a command to all online devices.
+            - ``upgrade-online``: Upgrade online devices if a newer firmware is available.
             - ``trigger-lwt-send``: Trigger LWT Online for all offline devices using Publish2 command.
         command: Command name for ``send-cmd`` (e.g. ``Power``). Required when ``action`` is ``send-cmd``.
         value: Value to send for ``send-cmd``
@@ -61,146 +284,69 @@ def _run(
         noisy: If ``True``, print/log additional information while receiving retained messages.
         noisy_lowerlevel: If ``True``, print/log lower-level debug info.
         dry_run: If ``True``, perform a dry run for actions that modify state.
+
+    Raises:
+        SystemExit: If the action is unknown.
     """
+    handler = ACTIONS.get(action)
+    if handler is None:
+        raise SystemExit(f"Unknown action: {action}")
+
     mqttcommander.configure_loguru_default_with_skiplog_filter()
     logger.enable("mqttcommander")
 
-    comm: MqttCommander = MqttCommander(
-        topics=TASMOTA_DEFAULT_TOPICS,
-        host=host,
-        port=port,
-        username=username,
-        password=password,
+    created: List["MqttCommander"] = []
+
+    def _mk_comm() -> "MqttCommander":
+        """Create and connect the commander for the actions that talk to the broker.
+
+        The connection (and its network loop) is started once here and then shared by all retained
+        reads and publishes of the action instead of reconnecting per step.
+
+        Returns:
+            MqttCommander: Connected commander for the given connection settings.
+        """
+        # deferred: pulls in paho-mqtt/pydantic/requests, only import what the chosen action needs
+        from mqttcommander import MqttCommander, TASMOTA_DEFAULT_TOPICS
+
+        comm: MqttCommander = MqttCommander(
+            topics=TASMOTA_DEFAULT_TOPICS,
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+        )
+        created.append(comm)
+        if not comm.mqttclient.wait_for_connect_and_start_loop():
+            raise SystemExit(f"Could not connect to MQTT broker {host}:{port}")
+
+        return comm
+
+    opts: argparse.Namespace = argparse.Namespace(
+        command=command,
+        value=value,
+        tasmota_json_dir=tasmota_json_dir,
+        timezone_name=timezone_name,
+        retained_msgs_receive_grace_s=retained_msgs_receive_grace_s,
+        noisy=noisy,
+        noisy_lowerlevel=noisy_lowerlevel,
+        dry_run=dry_run,
     )
 
-    match action:
-        case "readfromfile":
-            tz = pytz.timezone(timezone_name) if timezone_name else pytz.timezone("Europe/Berlin")
-            tasmotas = read_tasmotas_from_latest_file(
-                tasmota_json_dir=tasmota_json_dir,
-                timezone=tz,
-            )
-            count = len(tasmotas) if tasmotas else 0
-            logger.info(f"Loaded {count} tasmota devices from latest file")
-        case "list-retained-msgs":
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            noisy = False if not noisy else True
-            msgs = comm.get_all_retained_msgs(
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000, noisy=noisy
-            )
-            cnt = 0 if msgs is None else len(msgs)
-            logger.info(f"Retained messages matching topics {comm.topics}: {cnt}")
-            if msgs:
-                for m in msgs:
-                    logger.info(f"- {m.topic}")
-        case "list-tasmotas":
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            noisy = False if not noisy else True
-            noisy_lowerlevel = False if not noisy_lowerlevel else True
-
-            all_devs = comm.get_all_tasmota_devices_from_retained(
-                noisy=noisy,
-                noisy_lowerlevel=noisy_lowerlevel,
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000,
-            )
-            logger.info(f"Found {len(all_devs)} tasmota devices from retained data")
-            for d in all_devs:
-                tc = d.tasmota_config
-                name = None
-                if tc is not None:
-                    name = tc.device_name or tc.friendly_name or tc.topic
-
-                tw = textwrap.indent(Helper.get_pretty_dict_json_no_sort(d.model_dump()), "\t")
-                logger.info(f"- {name}\n{tw}")
-        case "list-online":
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            noisy_lowerlevel = False if not noisy_lowerlevel else True
-            noisy = False if not noisy else True
-            all_devs = comm.get_all_tasmota_devices_from_retained(
-                noisy=noisy,
-                noisy_lowerlevel=noisy_lowerlevel,
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000,
-            )
-
-            online = comm.filter_online_tasmotas_from_retained(all_tasmotas=all_devs, update_lwt_current_value=True)
-            logger.info(f"Online devices: {len(online)} / {len(all_devs)}")
-            for d in online:
-                tc = d.tasmota_config
-                name = None
-                if tc is not None:
-                    name = tc.device_name or tc.friendly_name or tc.topic
-
-                tw = textwrap.indent(Helper.get_pretty_dict_json_no_sort(d.model_dump()), "\t")
-                logger.info(f"- {name} online={d.lwt_current_value}\n{tw}")
-        case "send-cmd":
-            if not command:
-                raise SystemExit("--command is required for action send-cmd")
-            noisy = False if not noisy else True
-            noisy_lowerlevel = False if not noisy_lowerlevel else True
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            all_devs = comm.get_all_tasmota_devices_from_retained(
-                noisy=noisy,
-                noisy_lowerlevel=noisy_lowerlevel,
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000,
-            )
-            online = comm.filter_online_tasmotas_from_retained(all_devs)
-            # vals_typed = cast(
-            #     List[List[Union[str, float, dict, int]] | None] | None, [values] if values is not None else None
-            # )
-            val_typed = cast(List[Union[str, float, dict, int]] | None, value if value is not None else None)
-            comm.send_cmds_to_online_tasmotas(
-                online, to_be_used_commands=[command], values_to_send=[val_typed for _ in online]
-            )
-        case "upgrade-online":
-            dry_run = False if not dry_run else True
-            noisy = False if not noisy else True
-            noisy_lowerlevel = False if not noisy_lowerlevel else True
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            all_devs = comm.get_all_tasmota_devices_from_retained(
-                noisy=noisy,
-                noisy_lowerlevel=noisy_lowerlevel,
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000,
-            )
-            online = comm.filter_online_tasmotas_from_retained(all_devs)
-
-            comm.ensure_freshest_firmware(online_tasmotas=online, dry_run=dry_run)
-
-        case "trigger-lwt-send":
-            noisy = False if not noisy else True
-            noisy_lowerlevel = False if not noisy_lowerlevel else True
-            retained_msgs_receive_grace_s = retained_msgs_receive_grace_s or 5
-            all_devs = comm.get_all_tasmota_devices_from_retained(
-                noisy=noisy,
-                noisy_lowerlevel=noisy_lowerlevel,
-                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_s * 1000,
-            )
-            offline = [d for d in all_devs if not d.is_online()]
-            logger.info(f"Triggering LWT Online for {len(offline)} offline devices")
-
-            if offline:
-                # this is direct mqtt command-sending mode...
-                comm.mqttclient.wait_for_connect_and_start_loop()
-                for d in offline:
-                    if d.tasmota_config and d.tasmota_config.topic:
-                        topic = d.tasmota_config.topic
-                        cmd_topic = f"cmnd/{topic}/Publish2"
-                        cmd_payload = f"tele/{topic}/LWT Online"
-                        logger.info(f"Sending to {cmd_topic}: {cmd_payload}")
-                        comm.mqttclient.publish_one(topic=cmd_topic, value=cmd_payload)
-        case _:
-            raise SystemExit(f"Unknown action: {action}")
-
+    try:
+        handler(_mk_comm, opts)
+    finally:
+        for comm in created:
+            comm.mqttclient.disconnect()
 
-def main(argv: Optional[List[str]] = None) -> None:
-    """Entry point for the mqttcommander CLI.
 
-    Parses command-line arguments and invokes :func:`_run`.
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the CLI (once per process).
 
-    Args:
-        argv: Command-line arguments. Defaults to ``sys.argv[1:]``.
+    Returns:
+        argparse.ArgumentParser: The parser including all subcommands.
     """
-    import argparse
-
     parser = argparse.ArgumentParser(description="mqttcommander CLI")
 
     # Common connection options
@@ -239,7 +385,7 @@ def main(argv: Optional[List[str]] = None) -> None:
         dest="retained_msgs_receive_grace_s",
         type=int,
         default=None,
-        help="Time window in seconds to receive retained messages (default: 5)",
+        help="Maximum time window in seconds to receive retained messages (default: 5)",
     )
     p_ret.add_argument(
         "--noisy",
@@ -254,7 +400,7 @@ def main(argv: Optional[List[str]] = None) -> None:
         dest="retained_msgs_receive_grace_s",
         type=int,
         default=None,
-        help="Time window in seconds to receive retained messages (default: 5)",
+        help="Maximum time window in seconds to receive retained messages (default: 5)",
     )
     p_lt.add_argument(
         "--noisy",
@@ -275,7 +421,7 @@ def main(argv: Optional[List[str]] = None) -> None:
         dest="retained_msgs_receive_grace_s",
         type=int,
         default=None,
-        help="Time window in seconds to receive retained messages (default: 5)",
+        help="Maximum time window in seconds to receive retained messages (default: 5)",
     )
     p_lo.add_argument(
         "--noisy",
@@ -302,7 +448,7 @@ def main(argv: Optional[List[str]] = None) -> None:
         dest="retained_msgs_receive_grace_s",
         type=int,
         default=None,
-        help="Time window in seconds to receive retained messages (default: 5)",
+        help="Maximum time window in seconds to receive retained messages (default: 5)",
     )
     p_lwt.add_argument(
         "--noisy",
@@ -327,6 +473,19 @@ def main(argv: Optional[List[str]] = None) -> None:
         help='Disable actual sending upgrade - enable "dry run"',
     )
 
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for the mqttcommander CLI.
+
+    Parses command-line arguments and invokes :func:`_run`.
+
+    Args:
+        argv: Command-line arguments. Defaults to ``sys.argv[1:]``.
+    """
+    parser = _build_parser()
+
     args = parser.parse_args(argv)  # argv wird hier verwendet
 
     _run(
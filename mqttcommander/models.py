@@ -6,15 +6,141 @@ helpers to convert between rich models and the compact command formats
 expected by Tasmota.
 """
 
+import functools
+import re
 from datetime import datetime
-from io import StringIO
-from typing import Optional, Annotated, List, Literal, Any, Self
-
-from pydantic import BaseModel, Field, AliasPath, field_validator, AliasChoices, HttpUrl
-from pydantic.networks import IPv4Address
+from typing import Callable, Optional, Annotated, Dict, List, Literal, Any, Self, Tuple
+
+# straight from the defining submodules instead of through the lazy ``pydantic`` package namespace
+from pydantic.aliases import AliasChoices, AliasGenerator, AliasPath
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.functional_validators import AfterValidator, BeforeValidator, field_validator
+from pydantic.main import BaseModel
+from pydantic.networks import HttpUrl, IPv4Address
+from pydantic.type_adapter import TypeAdapter
 from pydantic_extra_types.mac_address import MacAddress
 
 
+@functools.lru_cache(maxsize=None)
+def _AC(*names: str) -> AliasChoices:
+    """Return a shared ``AliasChoices`` instance for the given alias names.
+
+    Args:
+        *names: Alias names to accept, in order of precedence.
+
+    Returns:
+        AliasChoices: The (cached) alias choices.
+    """
+    return AliasChoices(*names)
+
+
+# Tasmota keys that are not just the capitalized field name
+_TASMOTA_KEY_OVERRIDES: Dict[str, str] = {
+    "timedst": "TimeDST",
+    "timestd": "TimeSTD",
+    "stoponerror": "StopOnError",
+    "teleperiod": "TelePeriod",
+    "powerdelta1": "PowerDelta1",
+    "setoption4": "SetOption4",
+}
+
+
+def _tasmota_key(field_name: str) -> str:
+    """Return the Tasmota JSON key for a model field name (e.g. ``enable`` -> ``Enable``).
+
+    Args:
+        field_name: Name of the model field.
+
+    Returns:
+        str: The key Tasmota uses in its payloads.
+    """
+    return _TASMOTA_KEY_OVERRIDES.get(field_name) or field_name.capitalize()
+
+
+# accept the Tasmota key as well as the field name itself; only affects validation, dumps keep the field names
+_TASMOTA_MODEL_CONFIG: ConfigDict = ConfigDict(
+    populate_by_name=True, alias_generator=AliasGenerator(validation_alias=_tasmota_key)
+)
+
+# small value-type models (timers, DST/STD rules): immutable and thereby hashable
+_TASMOTA_LEAF_MODEL_CONFIG: ConfigDict = ConfigDict(**_TASMOTA_MODEL_CONFIG, frozen=True)
+
+
+# SMTWTFS weekday mask of a timer - compiled once instead of a per-field ``pattern=``; used with fullmatch(), as
+# "$" would also accept a trailing newline
+_DAYS_RE: re.Pattern[str] = re.compile(r"[10-]{7}")
+
+
+def _validate_days(v: str) -> str:
+    """Validate a timer's weekday mask.
+
+    Args:
+        v: Mask of seven ``1``/``0``/``-`` characters (Sunday first).
+
+    Returns:
+        str: The unchanged mask.
+
+    Raises:
+        ValueError: If ``v`` is not a valid weekday mask.
+    """
+    if _DAYS_RE.fullmatch(v) is None:
+        raise ValueError(f"days must be seven of '1', '0' or '-' (SMTWTFS), got {v!r}")
+
+    return v
+
+
+def _ranged(lo: int, hi: int) -> AfterValidator:
+    """Return a validator accepting integers in the closed range ``lo..hi``.
+
+    Args:
+        lo: Smallest allowed value.
+        hi: Largest allowed value.
+
+    Returns:
+        AfterValidator: Validator raising ``ValueError`` for values outside the range.
+    """
+    allowed: range = range(lo, hi + 1)
+
+    def _in_range(v: int) -> int:
+        if v not in allowed:
+            raise ValueError(f"value must be in {lo}..{hi}, got {v}")
+        return v
+
+    return AfterValidator(_in_range)
+
+
+# on/off flags (Enable, Repeat)
+_RANGE_0_1: AfterValidator = _ranged(0, 1)
+
+
+def _timezone_str(v: Any) -> Any:
+    """Convert a numeric timezone code (e.g. ``99`` as sent by Tasmota) to its string form.
+
+    Args:
+        v: Raw ``Timezone`` value.
+
+    Returns:
+        Any: ``str(v)`` for integers, anything else unchanged for the ``str`` validation.
+    """
+    return str(v) if isinstance(v, int) and not isinstance(v, bool) else v
+
+
+@functools.lru_cache(maxsize=64)
+def _dststd_command_string(*values: Optional[int]) -> str:
+    """Return the compact Tasmota list string for the given DST/STD rule values.
+
+    Devices share a handful of rules, so the strings are cached by value instead of being rebuilt on every call.
+
+    Args:
+        *values: Hemisphere, week, month, day, hour and offset of the rule.
+
+    Returns:
+        str: Compact Tasmota list representation without spaces.
+    """
+    return f"[{','.join(map(str, values))}]"
+
+
 class TasmotaTimerConfig(BaseModel):
     """Timer configuration for Tasmota devices.
 
@@ -29,39 +155,35 @@ class TasmotaTimerConfig(BaseModel):
         action: Output action (0=OFF, 1=ON, 2=TOGGLE, 3=RULE/BLINK).
     """
 
+    model_config = _TASMOTA_LEAF_MODEL_CONFIG
+
     # Enable	0 = disarm or disable timer
     # 1 = arm or enable timer
-    enable: Optional[Annotated[int, Field(ge=0, le=1)]] = Field(None, validation_alias=AliasChoices("Enable", "enable"))
+    enable: Optional[Annotated[int, _RANGE_0_1]] = None
 
     # Mode	0 = use clock time
     # 1 = Use local sunrise time using Longitude, Latitude and Time offset
     # 2 = use local sunset time using Longitude, Latitude and Time offset
-    mode: Optional[Annotated[int, Field(ge=0, le=2)]] = Field(None, validation_alias=AliasChoices("Mode", "mode"))
+    mode: Optional[Annotated[int, _ranged(0, 2)]] = None
 
     # Time	When Mode 0 is active
     # > hh:mm = set time in hours 0 .. 23 and minutes 0 .. 59
     # When Mode 1 or Mode 2 is active
     # > +hh:mm or -hh:mm = set offset in hours 0 .. 11 and minutes 0 .. 59 from the time defined by sunrise/sunset.
-    time: Optional[str] = Field(None, validation_alias=AliasChoices("Time", "time"))
+    time: Optional[str] = None
 
     # Window	0..15 = add or subtract a random number of minutes to Time
-    window: Optional[Annotated[int, Field(ge=0, le=15)]] = Field(
-        None, validation_alias=AliasChoices("Window", "window")
-    )
+    window: Optional[Annotated[int, _ranged(0, 15)]] = None
 
     # Days	SMTWTFS = set day of weeks mask where 0 or - = OFF and any different character = ON
-    days: Optional[Annotated[str, Field(pattern="[1|0|-]{7}")]] = Field(
-        None, validation_alias=AliasChoices("Days", "days")
-    )
+    days: Optional[Annotated[str, AfterValidator(_validate_days)]] = None
 
     # Repeat	0 = allow timer only once
     # 1 = repeat timer execution
-    repeat: Optional[Annotated[int, Field(ge=0, le=1)]] = Field(None, validation_alias=AliasChoices("Repeat", "repeat"))
+    repeat: Optional[Annotated[int, _RANGE_0_1]] = None
 
     # Output	1..16 = select an output to be used if no rule is enabled
-    output: Optional[Annotated[int, Field(ge=1, le=16)]] = Field(
-        None, validation_alias=AliasChoices("Output", "output")
-    )
+    output: Optional[Annotated[int, _ranged(1, 16)]] = None
 
     # Action	0 = turn output OFF
     # 1 = turn output ON
@@ -69,9 +191,7 @@ class TasmotaTimerConfig(BaseModel):
     # 3 = RULE/BLINK
     # If the Tasmota Rules feature has been activated by compiling the code (activated by default in all pre-compiled Tasmota binaries), a rule with Clock#Timer=<timer> will be triggered if written and turned on by the user.
     # If Rules are not compiled, BLINK output using BlinkCount parameters.
-    action: Optional[Annotated[int, Field(ge=1, le=16)]] = Field(
-        None, validation_alias=AliasChoices("Action", "action")
-    )
+    action: Optional[Annotated[int, _ranged(0, 3)]] = None
 
     # {"Timer1":{"Enable":1,"Mode":0,"Time":"22:00","Window":0,"Days":"1111111","Repeat":1,"Output":1,"Action":0}}
 
@@ -88,12 +208,14 @@ class TasmotaTimeZoneDSTSTD(BaseModel):
         offset: Offset minutes from UTC.
     """
 
-    hemisphere: Optional[int] = Field(None, validation_alias=AliasChoices("Hemisphere", "hemisphere"))
-    week: Optional[int] = Field(None, validation_alias=AliasChoices("Week", "week"))
-    month: Optional[int] = Field(None, validation_alias=AliasChoices("Month", "month"))
-    day: Optional[int] = Field(None, validation_alias=AliasChoices("Day", "day"))
-    hour: Optional[int] = Field(None, validation_alias=AliasChoices("Hour", "hour"))
-    offset: Optional[int] = Field(None, validation_alias=AliasChoices("Offset", "offset"))
+    model_config = _TASMOTA_LEAF_MODEL_CONFIG
+
+    hemisphere: Optional[int] = None
+    week: Optional[int] = None
+    month: Optional[int] = None
+    day: Optional[int] = None
+    hour: Optional[int] = None
+    offset: Optional[int] = None
 
     def to_tasmota_command_string(self) -> str:
         """Return Tasmota command string for this DST/STD rule.
@@ -101,12 +223,15 @@ class TasmotaTimeZoneDSTSTD(BaseModel):
         Returns:
             str: Compact Tasmota list representation without spaces.
         """
-        return str([self.hemisphere, self.week, self.month, self.day, self.hour, self.offset]).replace(" ", "")
+        return _dststd_command_string(self.hemisphere, self.week, self.month, self.day, self.hour, self.offset)
 
     @classmethod
     def from_tasmota_command_string(cls, values_comma_separated: str) -> TasmotaTimeZoneDSTSTD:
         """Create an instance from a Tasmota command string.
 
+        The instance is built with ``model_construct``, i.e. without pydantic validation: after ``int()``
+        every value already is what the plain ``Optional[int]`` fields accept.
+
         Args:
             values_comma_separated: Comma-separated values (6 elements).
 
@@ -115,19 +240,17 @@ class TasmotaTimeZoneDSTSTD(BaseModel):
 
         Raises:
             AssertionError: If input does not contain exactly 6 values.
+            ValueError: If a value is not an integer.
         """
         data: List[str] = values_comma_separated.split(",")
 
         assert len(data) == 6
 
-        return TasmotaTimeZoneDSTSTD(
-            hemisphere=int(data[0]),
-            week=int(data[1]),
-            month=int(data[2]),
-            day=int(data[3]),
-            hour=int(data[4]),
-            offset=int(data[5]),
-        )
+        hemisphere, week, month, day, hour, offset = map(int, data)
+
+        # all fields are plain ints at this point -> nothing left for pydantic to validate
+        # (only safe as long as the fields carry no constraints beyond int - revisit when adding some)
+        return cls.model_construct(hemisphere=hemisphere, week=week, month=month, day=day, hour=hour, offset=offset)
 
 
 class TasmotaTimezoneConfig(BaseModel):
@@ -138,20 +261,25 @@ class TasmotaTimezoneConfig(BaseModel):
         longitude: Longitude used for sunrise/sunset calculations.
         timedst: Daylight saving rule.
         timestd: Standard time rule.
-        timezone: Numeric code or ``+HH:MM`` string.
+        timezone: Numeric code (as string, e.g. ``"99"``) or ``+HH:MM`` string.
     """
 
-    latitude: Optional[float] = Field(None, validation_alias=AliasChoices("Latitude", "latitude"))
-    longitude: Optional[float] = Field(None, validation_alias=AliasChoices("Longitude", "longitude"))
-    timedst: Optional[TasmotaTimeZoneDSTSTD] = Field(None, validation_alias=AliasChoices("TimeDst", "timedst"))
-    timestd: Optional[TasmotaTimeZoneDSTSTD] = Field(None, validation_alias=AliasChoices("TimeStd", "timestd"))
-    timezone: Optional[int | str] = Field(None, validation_alias=AliasChoices("Timezone", "timezone"))  # 99 | +01:00
+    model_config = _TASMOTA_MODEL_CONFIG
 
-    def as_tasmota_command_list(self) -> List[str | float | dict[Any, Any] | int] | None:
-        """Return configuration as a Tasmota command list.
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    timedst: Optional[TasmotaTimeZoneDSTSTD] = None
+    timestd: Optional[TasmotaTimeZoneDSTSTD] = None
+    # "99" | "+01:00" - numeric codes are converted to str up front, no int | str union to resolve per value
+    timezone: Optional[Annotated[str, BeforeValidator(_timezone_str)]] = None
+
+    def _required_values(self) -> Tuple[float, float, TasmotaTimeZoneDSTSTD, TasmotaTimeZoneDSTSTD, str]:
+        """Return all five settings, checked to be present.
+
+        The explicit ``is not None`` tests (rather than ``None not in (...)``) are what let mypy narrow the types.
 
         Returns:
-            list: List containing latitude, longitude, dst rule, std rule, and timezone.
+            tuple: Latitude, longitude, dst rule, std rule, and timezone.
 
         Raises:
             AssertionError: If any required field is missing.
@@ -164,12 +292,25 @@ class TasmotaTimezoneConfig(BaseModel):
             and self.timezone is not None
         )
 
+        return self.latitude, self.longitude, self.timedst, self.timestd, self.timezone
+
+    def as_tasmota_command_list(self) -> List[str | float | dict[Any, Any] | int] | None:
+        """Return configuration as a Tasmota command list.
+
+        Returns:
+            list: List containing latitude, longitude, dst rule, std rule, and timezone.
+
+        Raises:
+            AssertionError: If any required field is missing.
+        """
+        latitude, longitude, timedst, timestd, timezone = self._required_values()
+
         return [
-            self.latitude,
-            self.longitude,
-            self.timedst.to_tasmota_command_string(),  # that is correct!
-            self.timestd.to_tasmota_command_string(),  # that is correct!
-            self.timezone,
+            latitude,
+            longitude,
+            timedst.to_tasmota_command_string(),  # that is correct!
+            timestd.to_tasmota_command_string(),  # that is correct!
+            timezone,
         ]
 
     def to_tasmota_command_string(self) -> str:
@@ -177,8 +318,16 @@ class TasmotaTimezoneConfig(BaseModel):
 
         Returns:
             str: Compact list string without spaces.
+
+        Raises:
+            AssertionError: If any required field is missing.
         """
-        return str(self.as_tasmota_command_list()).replace(" ", "")
+        latitude, longitude, timedst, timestd, timezone = self._required_values()
+
+        return (
+            f"[{latitude},{longitude},{timedst.to_tasmota_command_string()},"
+            f"{timestd.to_tasmota_command_string()},{timezone}]"
+        )
 
 
 class TasmotaDeviceConfig(BaseModel):
@@ -208,32 +357,34 @@ class TasmotaDeviceConfig(BaseModel):
         otaurl: Optional HttpUrl for firmware upgrades.
     """
 
+    model_config = _TASMOTA_MODEL_CONFIG
+
     friendly_name: Optional[str] = Field(
         None, validation_alias=AliasChoices("friendly_name", AliasPath("fn", 0))
     )  # friendly name -> first element of list of strings?
-    device_name: Optional[str] = Field(None, validation_alias=AliasChoices("dn", "device_name"))
-    hostname: Optional[str] = Field(None, validation_alias=AliasChoices("hn", "hostname"))  # host name
+    device_name: Optional[str] = Field(None, validation_alias=_AC("dn", "device_name"))
+    hostname: Optional[str] = Field(None, validation_alias=_AC("hn", "hostname"))  # host name
     manufacturer_description: Optional[str] = Field(
-        None, validation_alias=AliasChoices("md", "manufacturer_description")
+        None, validation_alias=_AC("md", "manufacturer_description")
     )  # manufacturer description ?!
     ip: Optional[IPv4Address] = None
     mac: Optional[MacAddress] = None
-    offline_msg: Optional[str] = Field(None, validation_alias=AliasChoices("ofln", "offline_msg"))
-    online_msg: Optional[str] = Field(None, validation_alias=AliasChoices("onln", "online_msg"))
+    offline_msg: Optional[str] = Field(None, validation_alias=_AC("ofln", "offline_msg"))
+    online_msg: Optional[str] = Field(None, validation_alias=_AC("onln", "online_msg"))
     state: Optional[List[str]] = None
     # t: str = Field(alias="topic", validation_alias='t')
-    topic: Optional[str] = Field(None, validation_alias=AliasChoices("t", "topic"))
+    topic: Optional[str] = Field(None, validation_alias=_AC("t", "topic"))
     tp: Optional[List[str]] = Field(None)
-    software_version: Optional[str] = Field(None, validation_alias=AliasChoices("sw", "software_version"))
+    software_version: Optional[str] = Field(None, validation_alias=_AC("sw", "software_version"))
     timezoneconfig: Optional[TasmotaTimezoneConfig] = None
-    teleperiod: Optional[int] = Field(None, validation_alias=AliasChoices("TelePeriod", "teleperiod"))
-    powerdelta1: Optional[int] = Field(None, validation_alias=AliasChoices("PowerDelta1", "powerdelta1"))
-    setoption4: Optional[Literal["ON", "OFF"]] = Field(None, validation_alias=AliasChoices("SetOption4", "setoption4"))
-    timer1: Optional[TasmotaTimerConfig] = Field(None, validation_alias=AliasChoices("Timer1", "timer1"))
-    timer2: Optional[TasmotaTimerConfig] = Field(None, validation_alias=AliasChoices("Timer2", "timer2"))
-    timer3: Optional[TasmotaTimerConfig] = Field(None, validation_alias=AliasChoices("Timer2", "timer3"))
-    timer4: Optional[TasmotaTimerConfig] = Field(None, validation_alias=AliasChoices("Timer4", "timer4"))
-    otaurl: Optional[HttpUrl] = Field(None, validation_alias=AliasChoices("otaurl", "ota_url"))
+    teleperiod: Optional[int] = None
+    powerdelta1: Optional[int] = None
+    setoption4: Optional[Literal["ON", "OFF"]] = None
+    timer1: Optional[TasmotaTimerConfig] = None
+    timer2: Optional[TasmotaTimerConfig] = None
+    timer3: Optional[TasmotaTimerConfig] = None
+    timer4: Optional[TasmotaTimerConfig] = None
+    otaurl: Optional[HttpUrl] = Field(None, validation_alias=_AC("otaurl", "ota_url"))
 
     # SSID1
     # SSID2
@@ -243,6 +394,21 @@ class TasmotaDeviceConfig(BaseModel):
     # setoption4
     # SetOption53 1; SetOption56 0; SetOption57 0;
 
+    @classmethod
+    def from_payload(cls, raw: str | bytes) -> Self:
+        """Validate a raw ``tasmota/discovery/<mac>/config`` payload.
+
+        The JSON is parsed by pydantic-core directly into the model, without building an
+        intermediate Python dict first.
+
+        Args:
+            raw: JSON payload as received via MQTT.
+
+        Returns:
+            TasmotaDeviceConfig: The parsed device configuration.
+        """
+        return cls.model_validate_json(raw)
+
     @field_validator("mac", mode="before")
     @classmethod
     def validate_mac(cls, v: Any) -> Optional[str]:
@@ -268,18 +434,23 @@ class TasmotaDeviceConfig(BaseModel):
             mac: MAC address without separators, or already colon-formatted.
 
         Returns:
-            str: Colon-separated MAC address.
+            str: Colon-separated MAC address; converted ones are upper-case, colon-formatted ones
+            (of any length) are returned unchanged.
+
+        Raises:
+            ValueError: If ``mac`` is neither colon-formatted nor an even number of hex digits.
         """
         if mac.find(":") == 2:
             return mac
 
-        ret: StringIO = StringIO()
-        for ch2i in range(0, len(mac), 2):
-            if ret.tell() > 0:
-                ret.write(":")
-            ret.write(mac[ch2i : ch2i + 2])
+        # hex digits -> bytes -> colon-separated hex, both steps done in C; hex() emits lower-case
+        raw: bytes = bytes.fromhex(mac)
+
+        # fromhex() silently skips whitespace between the digit pairs
+        if len(raw) * 2 != len(mac):
+            raise ValueError(f"not a MAC address: {mac!r}")
 
-        return ret.getvalue()
+        return raw.hex(":").upper()
 
 
 class TasmotaRule(BaseModel):
@@ -293,13 +464,13 @@ class TasmotaRule(BaseModel):
         rules: Raw rules string.
     """
 
-    state: Optional[Literal["ON", "OFF"]] = Field(None, validation_alias=AliasChoices("State", "state"))
-    once: Optional[Literal["ON", "OFF"]] = Field(None, validation_alias=AliasChoices("Once", "once"))
-    stoponerror: Optional[Literal["ON", "OFF"]] = Field(
-        None, validation_alias=AliasChoices("StopOnError", "stoponerror")
-    )
-    length: Optional[int] = Field(None, validation_alias=AliasChoices("Length", "length"))
-    rules: Optional[str] = Field(None, validation_alias=AliasChoices("Rules", "rules"))
+    model_config = _TASMOTA_MODEL_CONFIG
+
+    state: Optional[Literal["ON", "OFF"]] = None
+    once: Optional[Literal["ON", "OFF"]] = None
+    stoponerror: Optional[Literal["ON", "OFF"]] = None
+    length: Optional[int] = None
+    rules: Optional[str] = None
 
 
 class TasmotaDeviceSensors(BaseModel):
@@ -317,6 +488,10 @@ class TasmotaDeviceSensors(BaseModel):
     #        "SHT3X": {"Temperature": 26.1, "Humidity": 44.5, "DewPoint": 13.1}, "TempUnit": "C"}, "ver": 1}
 
 
+# raw ``tasmota/discovery/<mac>/sensors`` payload (str | bytes) -> TasmotaDeviceSensors, validator built once
+parse_sensors: Callable[..., TasmotaDeviceSensors] = TypeAdapter(TasmotaDeviceSensors).validate_json
+
+
 class TasmotaDevice(BaseModel):
     """Aggregate information known about a Tasmota device.
 
@@ -351,7 +526,7 @@ class TasmotaDevice(BaseModel):
         Returns:
             bool: True if online, False otherwise.
         """
-        if self.tasmota_config and self.tasmota_config.online_msg:
-            return self.lwt_current_value == self.tasmota_config.online_msg
+        tdc: Optional[TasmotaDeviceConfig] = self.tasmota_config
+        online_msg: Optional[str] = tdc.online_msg if tdc is not None else None
 
-        return self.lwt_current_value == lwt_online_default_value
+        return self.lwt_current_value == (online_msg or lwt_online_default_value)
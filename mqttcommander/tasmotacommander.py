@@ -6,34 +6,52 @@ collecting the responses. It also includes helpers to persist and reload
 discovered devices as JSON files.
 """
 
+import contextlib
 import difflib
+import functools
 import json
 import os
 import textwrap
 import threading
+import time
 
 from datetime import datetime, tzinfo
-from io import StringIO
+from json import JSONDecodeError
 from pathlib import Path
-from typing import Any, Literal, Set, Optional, List, Dict, ClassVar
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Literal,
+    Set,
+    Optional,
+    List,
+    Dict,
+    ClassVar,
+    Sequence,
+    Tuple,
+)
+from zoneinfo import ZoneInfo
 
 from mqttstuff import MWMqttMessage, MosquittoClientWrapper, MQTTLastDataReader
+from paho.mqtt.client import Client, MQTTMessage, MQTTMessageInfo
+from pydantic.type_adapter import TypeAdapter
 
 
-import pytz
-
-import Helper
 from mqttcommander.Helper import get_pretty_dict_json_no_sort, compare_tasmota_versions
 from mqttcommander.models import (
     TasmotaTimezoneConfig,
     TasmotaDeviceConfig,
     TasmotaRule,
-    TasmotaDeviceSensors,
+    parse_sensors,
     TasmotaDevice,
     TasmotaTimeZoneDSTSTD,
 )
 
 import loguru
+import orjson
 import requests
 import re
 from loguru import logger as glogger
@@ -54,6 +72,206 @@ TASMOTA_DISCOVERY_TOPIC_BEGIN: str = "tasmota/discovery"
 TASMOTA_LWT_TOPIC_BEGIN: str = "tele/"
 TASMOTA_LWT_TOPIC_END: str = "LWT"
 
+# (de-)serializer for the tasmota devices JSON files, built once (see write_tasmota_devices_file and
+# read_tasmotas_from_latest_file)
+_TASMOTA_DEVICE_LIST_ADAPTER: TypeAdapter[List[TasmotaDevice]] = TypeAdapter(List[TasmotaDevice])
+
+# seconds send_cmds_to_online_tasmotas waits for all devices to answer one command
+_CMD_RESPONSE_TIMEOUT_S: float = 10.0
+
+
+@functools.lru_cache(maxsize=16)
+def _build_cmd_maps(cmds: Tuple[str, ...]) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    """Map commands to their response topic names and build the topic filters to subscribe to.
+
+    Cached per command tuple since the same command sets are sent over and over; the returned
+    dict is shared between calls and must not be modified.
+
+    Args:
+        cmds: Command names as sent to ``cmnd/<topic>/<cmd>``.
+
+    Returns:
+        tuple: ``{cmd: response topic name}`` and the ``stat/+/...`` topic filters.
+    """
+    # cmnd/tasmota_0688AA/SetOption4 1 => enables mqtt result to stat/tasmota_06888F/[CMDNAME]
+    cmd_to_topic_map: Dict[str, str] = {cmd: cmd[:-1] if cmd[-1].isdigit() else cmd for cmd in cmds}
+
+    # dict.fromkeys: deduplicated like a set, but in a stable order
+    topics: Tuple[str, ...] = (
+        "stat/+/RESULT",
+        "stat/+/STATUS",
+        *(f"stat/+/{v}" for v in dict.fromkeys(cmd_to_topic_map.values())),
+    )
+
+    return cmd_to_topic_map, topics
+
+
+# paho on_message style callback: (client, userdata, message)
+_PahoMessageCallback = Callable[[Client, Any, MQTTMessage], None]
+
+
+@contextlib.contextmanager
+def _message_callbacks_added(client: Client, subs: Iterable[str], callback: _PahoMessageCallback) -> Iterator[None]:
+    """Register ``callback`` for the topic filters ``subs`` while the ``with`` block runs.
+
+    paho keeps one callback per filter: a callback the client already had for one of the filters keeps being
+    called (after ``callback``) meanwhile and is put back afterwards. Only the registrations made here are
+    removed - also if the block raises.
+
+    Args:
+        client: The paho client.
+        subs: Topic filters; duplicates are registered once.
+        callback: Callback for messages matching one of the filters.
+
+    Yields:
+        None
+    """
+    previous: Dict[str, _PahoMessageCallback | None] = {}
+
+    try:
+        for sub in dict.fromkeys(subs):
+            prev: _PahoMessageCallback | None
+            try:
+                # paho has no public getter for the callback registered for a filter
+                prev = client._on_message_filtered[sub]
+            except KeyError:
+                prev = None
+            previous[sub] = prev
+
+            if prev is None:
+                client.message_callback_add(sub, callback)
+            else:
+
+                def _both(c: Client, userdata: Any, msg: MQTTMessage, prev: _PahoMessageCallback = prev) -> None:
+                    try:
+                        callback(c, userdata, msg)
+                    finally:
+                        prev(c, userdata, msg)
+
+                client.message_callback_add(sub, _both)
+
+        yield
+    finally:
+        for sub, prev in previous.items():
+            if prev is None:
+                client.message_callback_remove(sub)
+            else:
+                client.message_callback_add(sub, prev)
+
+
+# handler(device, its config, response payload, collected timezone values) storing a command response
+_CmdResponseHandler = Callable[[TasmotaDevice, TasmotaDeviceConfig, Dict[str, Any], Dict[str, Any]], None]
+
+
+def _rule_setter(num: int) -> _CmdResponseHandler:
+    """Return a handler storing the ``Rule<num>`` response as the device's ``tasmota_rule<num>``.
+
+    Args:
+        num: Rule number (1..3).
+
+    Returns:
+        _CmdResponseHandler: The handler.
+    """
+    attr: str = f"tasmota_rule{num}"
+    key: str = f"Rule{num}"
+
+    def _set(td: TasmotaDevice, tdc: TasmotaDeviceConfig, value: Dict[str, Any], tzconfig: Dict[str, Any]) -> None:
+        setattr(td, attr, TasmotaRule.model_validate(value[key]))
+
+    return _set
+
+
+def _config_setter(field: str, key: str) -> _CmdResponseHandler:
+    """Return a handler storing the response value under ``key`` in the config field ``field``.
+
+    Args:
+        field: Field of :class:`TasmotaDeviceConfig` to set.
+        key: Key of the value in the response payload.
+
+    Returns:
+        _CmdResponseHandler: The handler.
+    """
+
+    def _set(td: TasmotaDevice, tdc: TasmotaDeviceConfig, value: Dict[str, Any], tzconfig: Dict[str, Any]) -> None:
+        setattr(tdc, field, value[key])
+
+    return _set
+
+
+def _update_tzconfig(
+    td: TasmotaDevice, tdc: TasmotaDeviceConfig, value: Dict[str, Any], tzconfig: Dict[str, Any]
+) -> None:
+    """Collect a timezone related response; the device's timezone config is rebuilt from these afterwards.
+
+    Args:
+        td: The device (unused).
+        tdc: The device's config (unused).
+        value: Response payload.
+        tzconfig: Timezone values collected so far for the device.
+    """
+    tzconfig.update(**value)
+
+
+# keys of the timezone command responses - picked out of the responses of a Backlog, which may chain anything
+_TZ_RESPONSE_KEYS: FrozenSet[str] = frozenset(("Latitude", "Longitude", "TimeDST", "TimeSTD", "Timezone"))
+
+
+def _update_tzconfig_from_backlog(
+    td: TasmotaDevice, tdc: TasmotaDeviceConfig, value: Dict[str, Any], tzconfig: Dict[str, Any]
+) -> None:
+    """Collect the timezone related part of a Backlog response; other chained commands are ignored.
+
+    Args:
+        td: The device (unused).
+        tdc: The device's config (unused).
+        value: Response payload of one of the chained commands.
+        tzconfig: Timezone values collected so far for the device.
+    """
+    tzconfig.update((k, v) for k, v in value.items() if k in _TZ_RESPONSE_KEYS)
+
+
+def _expected_responses(cmd: str, value: str | float | int | dict | None) -> int:
+    """Return the number of responses a device sends back for ``cmd`` with ``value``.
+
+    A ``Backlog`` answers once per chained command, every other command once.
+
+    Args:
+        cmd: Command name.
+        value: Value sent with the command.
+
+    Returns:
+        int: Number of responses to wait for.
+    """
+    if cmd.upper() == "BACKLOG" and isinstance(value, str):
+        return max(1, sum(1 for part in value.split(";") if part.strip()))
+
+    return 1
+
+
+# command -> response handler, looked up once per command instead of a match over all commands per response;
+# commands without an entry are sent, but their responses are not stored
+_CMD_RESPONSE_HANDLERS: Dict[str, _CmdResponseHandler] = {
+    "RULE1": _rule_setter(1),
+    "RULE2": _rule_setter(2),
+    "RULE3": _rule_setter(3),
+    **dict.fromkeys(("TIMEZONE", "LATITUDE", "LONGITUDE", "TIMEDST", "TIMESTD"), _update_tzconfig),
+    # ensure_correct_timezone_settings_for_tasmotas chains the timezone commands into one Backlog; its responses
+    # ({"Latitude":...}, {"TimeDST":{...}}, {"Timezone":99}, ...) come in one by one on stat/<topic>/RESULT
+    "BACKLOG": _update_tzconfig_from_backlog,
+    "TELEPERIOD": _config_setter("teleperiod", "TelePeriod"),
+    # 17:04:46.840 CMD: powerdelta
+    # 17:04:46.846 MQT: stat/tasmota_AB65AA/POWERDELTA = {"PowerDelta1":103}
+    "POWERDELTA1": _config_setter("powerdelta1", "PowerDelta1"),
+    # 17:04:45.530 CMD: setoption4 1
+    # 17:04:45.535 MQT: stat/tasmota_AB65AA/SETOPTION = {"SetOption4":"ON"}
+    "SETOPTION4": _config_setter("setoption4", "SetOption4"),
+    "TIMER1": _config_setter("timer1", "Timer1"),
+    "TIMER2": _config_setter("timer2", "Timer2"),
+    "TIMER3": _config_setter("timer3", "Timer3"),
+    "TIMER4": _config_setter("timer4", "Timer4"),
+    "OTAURL": _config_setter("otaurl", "OtaUrl"),
+}
+
 
 class MqttCommander:
     """Convenience wrapper around an MQTT client for Tasmota management.
@@ -140,21 +358,17 @@ class MqttCommander:
             msgs: List of received messages or ``None``.
 
         Returns:
-            list | None: Filtered list or ``None`` if empty/``None`` input.
+            list | None: Filtered list or ``None`` if nothing is left; without a drop filter the input is
+            returned unchanged.
         """
-        if self.msg_topicname_startwith_drop_filter is None or msgs is None:
+        if msgs is None or self.msg_topicname_startwith_drop_filter is None:
             return msgs
 
-        ret: list[MWMqttMessage] = []
-        for msg in msgs:
-            for sw in self.msg_topicname_startwith_drop_filter:
-                if not msg.topic.startswith(sw):
-                    ret.append(msg)
+        # the drop filter as tuple -> one C-level str.startswith() call checks all prefixes at once; built per call,
+        # so changes to the (public, mutable) filter set always apply
+        drop_prefixes: Tuple[str, ...] = tuple(self.msg_topicname_startwith_drop_filter)
 
-        if len(ret) == 0:
-            return None
-
-        return ret
+        return [msg for msg in msgs if not msg.topic.startswith(drop_prefixes)] or None
 
     def get_all_retained_msgs(
         self,
@@ -163,15 +377,20 @@ class MqttCommander:
         noisy: bool = False,
         rettype: Literal["json", "str", "int", "float", "valuemsg", "str_raw"] = "str_raw",
         fallback_rettype: Literal["json", "str", "int", "float", "valuemsg", "str_raw"] = "str_raw",
+        retained_idle_timeout_ms: int | None = None,
     ) -> list[MWMqttMessage] | None:
         """Return retained messages for the given topic filters.
 
         Args:
             topics: Topic filters to query; defaults to `self.topics`.
-            retained_msgs_receive_grace_ms: Wait time in ms to collect retained messages.
+            retained_msgs_receive_grace_ms: Wait time in ms to collect retained messages. With
+                ``retained_idle_timeout_ms`` set, this is the hard ceiling for the whole collection.
             noisy: Enable verbose logging in lower layers.
             rettype: Preferred return value type for message decoding.
             fallback_rettype: Fallback type if decoding fails.
+            retained_idle_timeout_ms: If given, stop collecting as soon as no retained message arrived
+                for this many ms (after the first one), instead of always waiting out the grace period.
+                If `self.mqttclient` is connected, its session is reused either way.
 
         Returns:
             list[MWMqttMessage] | None: Retained messages or ``None`` if none received.
@@ -190,9 +409,26 @@ class MqttCommander:
             and self.mqttclient.password is not None
         )
 
+        msgs: list[MWMqttMessage] | None
+
+        # a connected client is reused by the idle collector; without an idle timeout it then simply waits out the
+        # grace period, like the fresh-connection reader below
+        if retained_idle_timeout_ms is not None or self.mqttclient.is_connected():
+            msgs = self._get_retained_msgs_until_idle(
+                topics=topics,
+                retained_msgs_receive_grace_ms=retained_msgs_receive_grace_ms,
+                retained_idle_timeout_ms=(
+                    retained_idle_timeout_ms if retained_idle_timeout_ms is not None else retained_msgs_receive_grace_ms
+                ),
+                noisy=noisy,
+                rettype=rettype,
+                fallback_rettype=fallback_rettype,
+            )
+
+            return self.apply_topic_filter(msgs)
+
         # need fresh connect to server - otherwise, the retained data is not sent to a ("cleansession=true) client
-        # TODO: HT20251214 check if handing down provided mqttclient could be an option...
-        msgs: list[MWMqttMessage] | None = MQTTLastDataReader.get_most_recent_data_with_timeout(
+        msgs = MQTTLastDataReader.get_most_recent_data_with_timeout(
             host=self.mqttclient.host,
             port=self.mqttclient.port,
             username=self.mqttclient.username,
@@ -210,6 +446,174 @@ class MqttCommander:
 
         return msgs
 
+    def _get_retained_msgs_until_idle(
+        self,
+        topics: list[str],
+        retained_msgs_receive_grace_ms: int,
+        retained_idle_timeout_ms: int,
+        noisy: bool = False,
+        rettype: Literal["json", "str", "int", "float", "valuemsg", "str_raw"] = "str_raw",
+        fallback_rettype: Literal["json", "str", "int", "float", "valuemsg", "str_raw"] = "str_raw",
+    ) -> list[MWMqttMessage] | None:
+        """Collect retained messages until the retained stream goes silent.
+
+        The broker sends all retained messages right after SUBSCRIBE, so once no further message
+        arrived for ``retained_idle_timeout_ms`` the collection is considered complete.
+        ``retained_msgs_receive_grace_ms`` bounds the total wait (also when nothing is retained).
+
+        If `self.mqttclient` is already connected, its session is reused: the topic filters are
+        (re-)subscribed there - which makes the broker send the retained messages again - instead of
+        opening a fresh connection for every call.
+
+        Args:
+            topics: Topic filters to subscribe to.
+            retained_msgs_receive_grace_ms: Hard ceiling in ms for the whole collection.
+            retained_idle_timeout_ms: Silence in ms after the last retained message that ends the collection.
+            noisy: Enable verbose logging.
+            rettype: Preferred return value type for message decoding.
+            fallback_rettype: Fallback type if decoding fails.
+
+        Returns:
+            list[MWMqttMessage] | None: Retained messages or ``None`` if none received.
+        """
+        logger = self.__class__.logger.bind(skiplog=not noisy)
+
+        # the broker keeps one retained message per topic - keyed by topic, a re-delivery (e.g. of the
+        # subscription made on connect of a shared client) does not produce duplicates
+        received: Dict[str, MWMqttMessage] = {}
+        received_cond: threading.Condition = threading.Condition()
+        last_msg_monotonic: float = 0.0
+
+        def on_msg(client: Client, userdata: Any, msg: MQTTMessage) -> None:
+            """Store retained messages and wake up the waiting collector.
+
+            Args:
+                client: The paho client.
+                userdata: Userdata of the paho client.
+                msg: The received paho message.
+            """
+            nonlocal last_msg_monotonic
+
+            if not msg.retain:
+                return
+
+            try:
+                mwmsg: MWMqttMessage = MWMqttMessage.from_pahomsg(msg, rettype)
+            except JSONDecodeError as e:
+                logger.debug(f"CAUGHT JSON-decoding error for {msg.topic}: {e}")
+                mwmsg = MWMqttMessage.from_pahomsg(msg, fallback_rettype)
+
+            with received_cond:
+                received[mwmsg.topic] = mwmsg
+                last_msg_monotonic = time.monotonic()
+                received_cond.notify_all()
+
+        shared: bool = self.mqttclient.is_connected()
+        mq: MosquittoClientWrapper
+
+        if shared:
+            mq = self.mqttclient
+        else:
+            assert self.mqttclient.host is not None and self.mqttclient.port is not None
+
+            # fresh (clean session) connection -> broker delivers the retained messages on subscribe
+            mq = MosquittoClientWrapper(
+                host=self.mqttclient.host,
+                port=self.mqttclient.port,
+                username=self.mqttclient.username,
+                password=self.mqttclient.password,
+                topics=topics,
+                timeout_connect_seconds=5,
+            )
+            assert mq.client is not None
+            mq.client.on_message = on_msg
+
+            if not mq.wait_for_connect_and_start_loop():
+                logger.warning(f"Could not connect to {self.mqttclient.host}:{self.mqttclient.port}")
+                mq.disconnect()
+                return None
+
+        assert mq.client is not None
+
+        idle_s: float = retained_idle_timeout_ms / 1000.0
+        deadline: float = time.monotonic() + retained_msgs_receive_grace_ms / 1000.0
+
+        # on a shared session the callbacks and extra subscriptions are taken off again however the wait ends
+        try:
+            with _message_callbacks_added(mq.client, topics, on_msg) if shared else contextlib.nullcontext():
+                if shared:
+                    mq.client.subscribe([(topic, 1) for topic in topics])
+
+                with received_cond:
+                    while True:
+                        now: float = time.monotonic()
+                        if now >= deadline or (received and now - last_msg_monotonic >= idle_s):
+                            break
+
+                        wakeup: float = min(deadline, last_msg_monotonic + idle_s) if received else deadline
+                        received_cond.wait(timeout=wakeup - now)
+        finally:
+            if shared:
+                # keep the commander's own subscriptions
+                unsubscribe: List[str] = [topic for topic in topics if topic not in self.topics]
+                if unsubscribe:
+                    mq.client.unsubscribe(unsubscribe)
+            else:
+                mq.disconnect()
+
+        logger.debug(f"Received {len(received)} retained msgs for {topics=}")
+
+        return list(received.values()) or None
+
+    def publish_many(
+        self,
+        items: Sequence[Tuple[str, str | float | int | dict | None]],
+        qos: int = 0,
+        retain: bool = False,
+        timeout: float | None = 30,
+        mqttclient: MosquittoClientWrapper | None = None,
+    ) -> List[bool]:
+        """Publish multiple (topic, payload) pairs and wait for their completion once at the end.
+
+        In contrast to ``MosquittoClientWrapper.publish_one``/``publish_multiple``, which block on every
+        single publish, all messages are handed to the paho client first so they are on the wire
+        while the confirmations are drained.
+
+        Args:
+            items: ``(topic, payload)`` pairs to publish; ``dict`` payloads are sent JSON-encoded.
+            qos: MQTT QoS used for all messages.
+            retain: Retain flag used for all messages.
+            timeout: Timeout in seconds to wait for each publish to complete.
+            mqttclient: Connected client to publish with; defaults to `self.mqttclient`.
+
+        Returns:
+            list[bool]: Per item, whether the publish completed within the timeout.
+        """
+        logger = self.__class__.logger
+
+        client: Client | None = (mqttclient or self.mqttclient).client
+        assert client is not None
+
+        infos: List[MQTTMessageInfo] = [
+            client.publish(
+                topic=topic,
+                payload=json.dumps(payload, default=str) if isinstance(payload, dict) else payload,
+                qos=qos,
+                retain=retain,
+            )
+            for topic, payload in items
+        ]
+
+        ret: List[bool] = []
+        for (topic, _), info in zip(items, infos):
+            try:
+                info.wait_for_publish(timeout=timeout)
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"Publishing to {topic} failed: {e}")
+            ret.append(info.is_published())
+
+        return ret
+
     def start_loop_forever(
         self, rettype: Literal["json", "str", "int", "float", "valuemsg", "str_raw"] = "str_raw"
     ) -> None:
@@ -229,12 +633,16 @@ class MqttCommander:
             msg: Received MQTT message.
             userdata: Optional user data passed by the client.
         """
-        if self.msg_topicname_startwith_drop_filter is not None:
-            for sw in self.msg_topicname_startwith_drop_filter:
-                if msg.topic.startswith(sw):
-                    return
+        # empty/no filter: skip the startswith() call altogether
+        if self.msg_topicname_startwith_drop_filter and msg.topic.startswith(
+            tuple(self.msg_topicname_startwith_drop_filter)
+        ):
+            return
 
-        self.__class__.logger.debug(get_pretty_dict_json_no_sort(msg.model_dump(by_alias=True)))
+        # lazy: the dump is only built if a sink actually accepts DEBUG - this runs for every inbound message
+        self.__class__.logger.opt(lazy=True).debug(
+            "{}", lambda: get_pretty_dict_json_no_sort(msg.model_dump(by_alias=True))
+        )
 
     def send_cmds_to_online_tasmotas(
         self,
@@ -301,18 +709,10 @@ class MqttCommander:
                     assert len(vt) == len(to_be_used_commands), f"{len(vt)=} != {len(to_be_used_commands)=}"
 
         # TODO topics as parameters
-        topics: List[str] = ["stat/+/RESULT", "stat/+/STATUS"]
-        cmd_to_topic_map: Dict[str, str] = {}
-
-        # cmnd/tasmota_0688AA/SetOption4 1 => enables mqtt result to stat/tasmota_06888F/[CMDNAME]
-        for cmd in to_be_used_commands:
-            if cmd[-1].isdigit():
-                cmd_to_topic_map[cmd] = cmd[0:-1]
-            else:
-                cmd_to_topic_map[cmd] = cmd
-
-        for v in set(cmd_to_topic_map.values()):
-            topics.append(f"stat/+/{v}")
+        cmd_to_topic_map: Dict[str, str]
+        topics_t: Tuple[str, ...]
+        cmd_to_topic_map, topics_t = _build_cmd_maps(tuple(to_be_used_commands))
+        topics: List[str] = list(topics_t)
 
         logger.debug("cmd_to_topic_map:")
         logger.debug(cmd_to_topic_map)
@@ -331,147 +731,204 @@ class MqttCommander:
             and self.mqttclient.password is not None
         )
 
-        # TODO: HT20251214 new connection really necessary here ?!
-        mq: MosquittoClientWrapper = MosquittoClientWrapper(
-            host=self.mqttclient.host,
-            port=self.mqttclient.port,
-            username=self.mqttclient.username,
-            password=self.mqttclient.password,
-            # topics=[f"stat/{td.tasmota_config.topic}/#"],
-            topics=topics,
-            timeout_connect_seconds=5,
-        )
-
-        # mq.add_message_callback("f"stat/{td.tasmota_config.topic}/")
-        mq.wait_for_connect_and_start_loop()
-
-        for num, (td, vt) in enumerate(zip(tasmota_online, values_to_send_online), start=1):
-            assert td.tasmota_config is not None
+        # an already connected commander session is reused (no TCP/MQTT handshake per call) - the response topics are
+        # just subscribed there additionally; otherwise a dedicated connection is opened for this run
+        shared: bool = self.mqttclient.is_connected()
+        mq: MosquittoClientWrapper
 
-            logger.debug(f"{num}: {td.tasmota_config.topic} -> {vt=}")
-
-            tzconfig: Dict = td.tasmota_config.timezoneconfig.model_dump() if td.tasmota_config.timezoneconfig else {}
-
-            for index, cmd in enumerate(to_be_used_commands):
-                to_send_value: None | str | float | dict = None
-                if vt:
-                    to_send_value = vt[index]
+        if shared:
+            mq = self.mqttclient
+            assert mq.client is not None
+            mq.client.subscribe([(topic, 1) for topic in topics])
+        else:
+            mq = MosquittoClientWrapper(
+                host=self.mqttclient.host,
+                port=self.mqttclient.port,
+                username=self.mqttclient.username,
+                password=self.mqttclient.password,
+                # topics=[f"stat/{td.tasmota_config.topic}/#"],
+                topics=topics,
+                timeout_connect_seconds=5,
+            )
 
-                cmd_topic: str = f"cmnd/{td.tasmota_config.topic}/{cmd}"
+            # let paho put one command per device on the wire at once instead of queueing them behind the default
+            # in-flight window of 20 (only relevant for qos>0 - and only settable before connecting)
+            assert mq.client is not None
+            mq.client.max_inflight_messages_set(len(tasmota_online) + 1)
+            mq.client.max_queued_messages_set(0)
+
+        try:
+            if not shared:
+                # mq.add_message_callback("f"stat/{td.tasmota_config.topic}/")
+                mq.wait_for_connect_and_start_loop()
+
+            # per device, resolved once for all commands instead of per (device, command): config, topic, name and the
+            # command independent RESULT topic
+            configs: List[TasmotaDeviceConfig] = []
+            tzconfigs: List[Dict] = []
+            for td in tasmota_online:
+                assert td.tasmota_config is not None
+                configs.append(td.tasmota_config)
+                tzconfigs.append(
+                    td.tasmota_config.timezoneconfig.model_dump() if td.tasmota_config.timezoneconfig else {}
+                )
 
-                logger.debug(f"\t{cmd_topic=} -> {to_send_value=}")
+            dev_topics: List[str | None] = [tdc.topic for tdc in configs]
+            dev_names: List[str | None] = [tdc.device_name for tdc in configs]
+            result_topics: List[str] = [f"stat/{dev_topic}/RESULT" for dev_topic in dev_topics]
+
+            # responses of the command currently in flight, keyed by topic in arrival order - fed by one callback
+            # registered once for all devices and commands instead of adding/removing two callbacks per device and
+            # command
+            msg_received_cond: threading.Condition = threading.Condition()
+            resp_data: Dict[str, List[MWMqttMessage]] = {}
+            # response topics of the current command -> index of the device answering there, and the devices still
+            # waited for -> number of responses still missing (a Backlog answers once per chained command): each
+            # response settles its device in O(1) instead of re-checking all devices per message
+            awaited_topics: Dict[str, int] = {}
+            outstanding: Dict[int, int] = {}
+
+            def msg_received(client: Client, userdata: Any, pahomsg: MQTTMessage) -> None:
+                """Callback for when an MQTT message is received on one of the response topic filters.
+
+                Only responses to the command in flight are decoded; a payload that cannot be decoded (empty, not
+                UTF-8, broken JSON) is logged and still settles its device instead of raising in paho's network thread.
+
+                Args:
+                    client: The paho client.
+                    userdata: Userdata of the paho client.
+                    pahomsg: The received paho message.
+                """
+                with msg_received_cond:
+                    if pahomsg.topic not in awaited_topics:
+                        return
 
-                cmd_res: str = cmd_to_topic_map[cmd]
+                msg: MWMqttMessage | None = None
+                try:
+                    # rettype="str" auto-decodes JSON objects
+                    msg = MWMqttMessage.from_pahomsg(pahomsg, "str")
+                except (IndexError, UnicodeDecodeError, JSONDecodeError) as e:
+                    logger.warning(f"IGNORING undecodable response on {pahomsg.topic}: {e!r}")
 
-                result_topic: str = f"stat/{td.tasmota_config.topic}/RESULT"
-                cmd_res_topic: str = f"stat/{td.tasmota_config.topic}/{cmd_res}"
+                logger.debug(f"MSG Received :: {msg=}")
 
-                msg_received_cond: threading.Condition = threading.Condition()
-                # msg_received_bool: bool = False
-                resp_data: Dict[str, MWMqttMessage] = {}
+                with msg_received_cond:
+                    if msg is not None:
+                        resp_data.setdefault(msg.topic, []).append(msg)
+
+                    device_index: int | None = awaited_topics.get(pahomsg.topic)
+                    if device_index is not None and device_index in outstanding:
+                        outstanding[device_index] -= 1
+                        if outstanding[device_index] <= 0:
+                            del outstanding[device_index]
+                            if not outstanding:
+                                msg_received_cond.notify_all()
+
+            # mq.set_on_msg_callback(msg_received, rettype="str")  # rettype="str" macht ein auto-try auf json-decode...
+            # registered on the subscribed response filters only - not on all of stat/+/#; taken off again (and
+            # callbacks the shared client already had there put back) however the command loop ends
+            assert mq.client is not None
+            with _message_callbacks_added(mq.client, topics, msg_received):
+                # commands stay one after the other: all devices answer on stat/<topic>/RESULT, so a response can
+                # only be attributed to a command while that command is the only one in flight
+                for index, cmd in enumerate(to_be_used_commands):
+                    cmd_res: str = cmd_to_topic_map[cmd]
+                    # tasmota commands are case-insensitive, the handler table is keyed upper-case
+                    response_handler: _CmdResponseHandler | None = _CMD_RESPONSE_HANDLERS.get(cmd.upper())
+
+                    # (result_topic, cmd_res_topic) per online device
+                    resp_topics: List[Tuple[str, str]] = []
+                    to_publish: List[Tuple[str, str | float | int | dict | None]] = []
+
+                    for num, (dev_topic, result_topic, vt) in enumerate(
+                        zip(dev_topics, result_topics, values_to_send_online), start=1
+                    ):
+                        to_send_value: None | str | float | dict | int = None
+                        if vt:
+                            to_send_value = vt[index]
+
+                        cmd_topic: str = f"cmnd/{dev_topic}/{cmd}"
+                        logger.debug(f"{num}: {cmd_topic=} -> {to_send_value=}")
+
+                        cmd_res_topic: str = f"stat/{dev_topic}/{cmd_res}"
+
+                        resp_topics.append((result_topic, cmd_res_topic))
+                        to_publish.append((cmd_topic, to_send_value))
+
+                    # armed before publishing - a response may come in before publish_many() returns
+                    with msg_received_cond:
+                        resp_data.clear()
+                        awaited_topics.clear()
+                        for i, (result_topic, cmd_res_topic) in enumerate(resp_topics):
+                            awaited_topics[result_topic] = i
+                            awaited_topics[cmd_res_topic] = i
+                        outstanding.clear()
+                        outstanding.update(
+                            (i, _expected_responses(cmd, to_send_value))
+                            for i, (_, to_send_value) in enumerate(to_publish)
+                        )
 
-                def msg_received(msg: MWMqttMessage, userdata: Any) -> None:
-                    """Callback for when an MQTT message is received.
+                    # td.tasmota_config.tp[0] -> cmnd
+                    # td.tasmota_config.tp[1] ->stat
+                    # td.tasmota_config.tp[1] ->tele
 
-                    Args:
-                        msg: The received MQTT message.
-                        userdata: Optional user data.
-                    """
-                    logger.debug(f"MSG Received :: {msg=} {userdata=}")
+                    # fire the command at all devices first, then collect the responses in one go
+                    published: List[bool] = self.publish_many(to_publish, timeout=5, mqttclient=mq)
 
                     with msg_received_cond:
-                        msg_received_cond.notify_all()
-                        # msg_received_bool = True
-                        resp_data[msg.topic] = msg
+                        # no response to wait for from devices the command could not be published to
+                        for i, pub in enumerate(published):
+                            if not pub:
+                                outstanding.pop(i, None)
+                        all_received: bool = msg_received_cond.wait_for(
+                            lambda: not outstanding, timeout=_CMD_RESPONSE_TIMEOUT_S
+                        )
+                    logger.debug(f"{cmd}: all responses received: {all_received=}")
 
-                # mq.set_on_msg_callback(msg_received, rettype="str")  # rettype="str" macht ein auto-try auf json-decode...
-                mq.add_message_callback(sub=result_topic, callback=msg_received, rettype="str")
-                mq.add_message_callback(sub=cmd_res_topic, callback=msg_received, rettype="str")
+                    for td, tdc, dev_name, tzconfig, published_success, (result_topic, cmd_res_topic) in zip(
+                        tasmota_online, configs, dev_names, tzconfigs, published, resp_topics
+                    ):
+                        logger.debug(f"{cmd} [{dev_name}] -> {published_success=}")
 
-                # td.tasmota_config.tp[0] -> cmnd
-                # td.tasmota_config.tp[1] ->stat
-                # td.tasmota_config.tp[1] ->tele
+                        if not published_success:
+                            logger.debug("SKIPPING since not properly published...")
+                            continue
 
-                published_success: bool = mq.publish_one(topic=cmd_topic, value=to_send_value, timeout=5, rettype="str")
-                logger.debug(
-                    f"{cmd_topic} [{td.tasmota_config.device_name}] -> published {to_send_value=} -> {published_success=}"
-                )
-
-                if not published_success:
-                    logger.debug("SKIPPING since not properly published...")
-                    continue
-
-                with msg_received_cond:
-                    wait_success: bool = msg_received_cond.wait(timeout=10)
-                    logger.debug(f"MSG[{result_topic}] -> WaitingSuccess {wait_success=}")
-                    if not wait_success:
-                        logger.debug("SKIPPING since no msg received properly...")
-                        continue
-
-                    wait2: bool = msg_received_cond.wait_for(
-                        lambda: result_topic in resp_data or cmd_res_topic in resp_data, timeout=10
-                    )
-                    logger.debug(
-                        f"Waiting for {result_topic}|{cmd_res_topic} [{td.tasmota_config.device_name}] to be in resp_data: {wait2=}"
-                    )
-                    if not wait2:
-                        logger.debug("SKIPPING since response not received properly...")
-                        continue
-
-                msg_me: MWMqttMessage | None = resp_data.get(result_topic, resp_data.get(cmd_res_topic, None))
-                logger.debug(f"{msg_me=}")
-
-                assert msg_me is not None and msg_me.value is not None and isinstance(msg_me.value, dict)
-
-                # {"Command":"Unknown"
-                if "Command" in msg_me.value and msg_me.value["Command"] == "Unknown":
-                    logger.debug("SKIPPING since command is not known to this DEVICE...")
-
-                    if result_topic in resp_data:
-                        del resp_data[result_topic]
-                    if cmd_res_topic in resp_data:
-                        del resp_data[cmd_res_topic]
+                        with msg_received_cond:
+                            msgs_me: List[MWMqttMessage] = list(
+                                resp_data.get(result_topic) or resp_data.get(cmd_res_topic) or ()
+                            )
+                        logger.debug(f"{msgs_me=}")
 
-                    continue
+                        if not msgs_me:
+                            logger.debug(
+                                f"SKIPPING since no response on {result_topic}|{cmd_res_topic} [{dev_name}]..."
+                            )
+                            continue
+
+                        # one response per command - or one per chained command of a Backlog, in the order sent
+                        for msg_me in msgs_me:
+                            assert msg_me.value is not None and isinstance(msg_me.value, dict)
+
+                            # {"Command":"Unknown"
+                            if "Command" in msg_me.value and msg_me.value["Command"] == "Unknown":
+                                logger.debug("SKIPPING since command is not known to this DEVICE...")
+                                continue
+
+                            if response_handler is not None:
+                                response_handler(td, tdc, msg_me.value, tzconfig)
+        finally:
+            if shared:
+                # keep the commander's own subscriptions
+                unsubscribe: List[str] = [topic for topic in topics if topic not in self.topics]
+                if unsubscribe:
+                    assert mq.client is not None
+                    mq.client.unsubscribe(unsubscribe)
+            else:
+                mq.disconnect()
 
-                match cmd:
-                    case "RULE1":
-                        td.tasmota_rule1 = TasmotaRule(**msg_me.value["Rule1"])
-                    case "RULE2":
-                        td.tasmota_rule2 = TasmotaRule(**msg_me.value["Rule2"])
-                    case "RULE3":
-                        td.tasmota_rule3 = TasmotaRule(**msg_me.value["Rule3"])
-                    case "TIMEZONE" | "LATITUDE" | "LATITUDE" | "LONGITUDE" | "TIMEDST" | "TIMESTD":
-                        tzconfig.update(**msg_me.value)
-                    case "TELEPERIOD":
-                        td.tasmota_config.teleperiod = msg_me.value["TelePeriod"]
-                    case "POWERDELTA1":
-                        td.tasmota_config.powerdelta1 = msg_me.value["PowerDelta1"]
-                    case "SETOPTION4":
-                        td.tasmota_config.setoption4 = msg_me.value["SetOption4"]
-                    case "TIMER1":
-                        td.tasmota_config.timer1 = msg_me.value["Timer1"]
-                    case "TIMER2":
-                        td.tasmota_config.timer2 = msg_me.value["Timer2"]
-                    case "TIMER3":
-                        td.tasmota_config.timer3 = msg_me.value["Timer3"]
-                    case "TIMER4":
-                        td.tasmota_config.timer4 = msg_me.value["Timer4"]
-                    case "OTAURL":
-                        td.tasmota_config.otaurl = msg_me.value["OtaUrl"]
-
-                    # 17:04:45.530 CMD: setoption4 1
-                    # 17:04:45.535 MQT: stat/tasmota_AB65AA/SETOPTION = {"SetOption4":"ON"}
-                    # 17:04:46.840 CMD: powerdelta
-                    # 17:04:46.846 MQT: stat/tasmota_AB65AA/POWERDELTA = {"PowerDelta1":103}
-
-                if result_topic in resp_data:
-                    del resp_data[result_topic]
-                if cmd_res_topic in resp_data:
-                    del resp_data[cmd_res_topic]
-
-                mq.remove_message_callback(sub=result_topic)
-                mq.remove_message_callback(sub=cmd_res_topic)
+        for td, tzconfig in zip(tasmota_online, tzconfigs):
+            assert td.tasmota_config is not None
 
             # logger.debug(f"tzconfig:{get_pretty_dict_json(tzconfig)}")
             if len(tzconfig) > 0:
@@ -481,14 +938,12 @@ class MqttCommander:
                 else:
                     logger.debug("NONE")
 
-                td.tasmota_config.timezoneconfig = TasmotaTimezoneConfig(**tzconfig)
+                td.tasmota_config.timezoneconfig = TasmotaTimezoneConfig.model_validate(tzconfig)
                 logger.debug("NEW TZ CONFIG:")
                 logger.debug(td.tasmota_config.timezoneconfig.model_dump())
 
             # logger.debug(get_pretty_dict_jsonnosort(td.model_dump(mode="python", exclude_none=False, exclude_defaults=False, by_alias=False)))
 
-        mq.disconnect()
-
         return tasmotas
 
     def ensure_freshest_firmware(
@@ -588,39 +1043,47 @@ class MqttCommander:
             longitude=9.8940783,
             timedst=TasmotaTimeZoneDSTSTD.from_tasmota_command_string("0,0,3,1,1,120"),
             timestd=TasmotaTimeZoneDSTSTD.from_tasmota_command_string("0,0,10,1,1,60"),
-            timezone=99,
+            timezone="99",
         )
 
         assert timezoneconfig is not None
 
         to_be_updated_tasmotas: List[TasmotaDevice] = []
 
-        to_be_sent_commands: List[str] = ["Latitude", "Longitude", "TimeDST", "TimeSTD", "TimeZone"]
+        tz_commands: List[str] = ["Latitude", "Longitude", "TimeDST", "TimeSTD", "TimeZone"]
+        # all five settings chained into one Backlog command -> one publish and one response wait per device
+        # instead of five sequential command round-trips; the value is the same for every device
+        backlog: str = "; ".join(
+            f"{cmd} {value}" for cmd, value in zip(tz_commands, timezoneconfig.as_tasmota_command_list() or [])
+        )
+        # WAS (one command each):
+        # [
+        #     53.6437753,
+        #     9.8940783,
+        #     "0,0,3,1,1,120",
+        #     "0,0,10,1,1,60",
+        #     99
+        # ]
+
         values_to_send: list[list[str | float | dict | int] | None] = []
 
         for tdo in online_tasmotas:
             assert tdo.tasmota_config is not None and tdo.tasmota_config.timezoneconfig is not None
 
-            if tdo.is_online() and tdo.tasmota_config.timezoneconfig.timezone != 99:
+            if tdo.is_online() and tdo.tasmota_config.timezoneconfig.timezone != "99":
                 logger.debug(
                     f"TIMEZONE is off for {tdo.tasmota_config.device_name} -> {tdo.tasmota_config.topic} -> TIMEZONE={tdo.tasmota_config.timezoneconfig.timezone}"
                 )
                 to_be_updated_tasmotas.append(tdo)
-                values_to_send.append(timezoneconfig.as_tasmota_command_list())
-                # WAS:
-                # values_to_send.append(
-                #                 [
-                #                     53.6437753,
-                #                     9.8940783,
-                #                     "0,0,3,1,1,120",
-                #                     "0,0,10,1,1,60",
-                #                     99
-                #                 ]
-                #             )
-
-        return self.send_cmds_to_online_tasmotas(
-            tasmotas=online_tasmotas, to_be_used_commands=to_be_sent_commands, values_to_send=values_to_send
-        )
+                values_to_send.append([backlog])
+
+        if to_be_updated_tasmotas:
+            # only the devices to update - values_to_send holds one entry per device to update
+            self.send_cmds_to_online_tasmotas(
+                tasmotas=to_be_updated_tasmotas, to_be_used_commands=["Backlog"], values_to_send=values_to_send
+            )
+
+        return online_tasmotas
 
     def update_online_tasmotas(self, tasmotas: List[TasmotaDevice]) -> List[TasmotaDevice]:
         """Query a set of devices and return only those that are online with fresh data.
@@ -635,10 +1098,6 @@ class MqttCommander:
 
         tasmota_online: List[TasmotaDevice] = []
 
-        for tdo in tasmotas:
-            if not tdo.is_online():
-                continue
-
         for num, tdo in enumerate(tasmotas, start=1):
             assert tdo.tasmota_config is not None
 
@@ -661,7 +1120,7 @@ class MqttCommander:
         return tasmota_online
 
     def read_tasmotas_from_file_update_save_to_file(
-        self, tasmota_json_dir: Path | None = None, timezone: tzinfo = pytz.timezone("Europe/Berlin")
+        self, tasmota_json_dir: Path | None = None, timezone: tzinfo = ZoneInfo("Europe/Berlin")
     ) -> None:
         """Read Tasmota devices from the latest snapshot, update their state, and save.
 
@@ -678,12 +1137,8 @@ class MqttCommander:
         if not tds:
             return
 
-        tds_dumps: List[str] = [
-            get_pretty_dict_json_no_sort(
-                td.model_dump(mode="python", exclude_none=False, exclude_defaults=False, by_alias=False)
-            )
-            for td in tds
-        ]
+        # snapshots via pydantic-core's JSON serializer (same content as the device file)
+        tds_dumps: List[str] = [td.model_dump_json(indent=2) for td in tds]
 
         online_tasmotas: List[TasmotaDevice] = self.filter_online_tasmotas_from_retained(
             all_tasmotas=tds, update_lwt_current_value=True
@@ -693,25 +1148,35 @@ class MqttCommander:
             tasmotas=online_tasmotas
         )  # das update_online_tasmots macht AUCH ein inline update -> tds[X] wird aktualisiert...
 
-        for index, td in enumerate(tds):
-            mydump: str = get_pretty_dict_json_no_sort(
-                td.model_dump(mode="python", exclude_none=False, exclude_defaults=False, by_alias=False)
-            )
-            previous_data: str = tds_dumps[index]
-
-            diff_str: StringIO = StringIO()
-            changecount: int = 0
-            for l in difflib.unified_diff(previous_data, mydump, fromfile=f"PREVIOUS", tofile=f"UPDATED"):
-                diff_str.write(l)
-                changecount += 1
+        # only the online devices get touched by the LWT refresh and the update - the others are not dumped again
+        touched: Set[int] = {id(td) for td in online_tasmotas}
 
+        for td, previous_data in zip(tds, tds_dumps):
             assert td.tasmota_config is not None
-            if changecount > 0:
-                logger.debug(
-                    f"{td.tasmota_config.topic} -> [{changecount=}]\n{textwrap.indent(diff_str.getvalue(), "\t")}"
-                )
-            else:
+
+            if id(td) not in touched:
+                logger.debug(f"{td.tasmota_config.topic} -> NOTHING CHANGED.")
+                continue
+
+            mydump: str = td.model_dump_json(indent=2)
+
+            if mydump == previous_data:
                 logger.debug(f"{td.tasmota_config.topic} -> NOTHING CHANGED.")
+                continue
+
+            # diff line by line - handing the strings to unified_diff directly would compare character-wise
+            diff: List[str] = list(
+                difflib.unified_diff(
+                    previous_data.splitlines(keepends=True),
+                    mydump.splitlines(keepends=True),
+                    fromfile="PREVIOUS",
+                    tofile="UPDATED",
+                    n=2,
+                )
+            )
+            changecount: int = len(diff)
+
+            logger.debug(f"{td.tasmota_config.topic} -> [{changecount=}]\n{textwrap.indent("".join(diff), "\t")}")
 
         write_tasmota_devices_file(tasmotas=tds)
 
@@ -721,6 +1186,7 @@ class MqttCommander:
         retained_msgs_receive_grace_ms: int = 2_000,
         noisy: bool = False,
         noisy_lowerlevel: bool = False,
+        retained_idle_timeout_ms: int | None = None,
     ) -> list[TasmotaDevice]:
         """Build a device list from retained discovery and LWT messages.
 
@@ -729,6 +1195,8 @@ class MqttCommander:
             retained_msgs_receive_grace_ms: Time to wait for retained messages in milliseconds.
             noisy: Enable high-level debug logging.
             noisy_lowerlevel: Enable lower-level debug logging when reading retained.
+            retained_idle_timeout_ms: Stop receiving once the retained stream was silent for this
+                many ms; see :meth:`get_all_retained_msgs`.
 
         Returns:
             list[TasmotaDevice]: Aggregated device models.
@@ -742,49 +1210,43 @@ class MqttCommander:
         msgs: list[MWMqttMessage] | None = self.get_all_retained_msgs(
             topics=topics,
             retained_msgs_receive_grace_ms=retained_msgs_receive_grace_ms,
-            rettype="json",
+            # raw payloads: config/sensors JSON is validated by pydantic-core directly, LWT values are plain strings
+            rettype="str_raw",
             noisy=noisy_lowerlevel,
             fallback_rettype="str_raw",
+            retained_idle_timeout_ms=retained_idle_timeout_ms,
         )
 
         tdlookup: dict[str, TasmotaDevice] = {}
         td: TasmotaDevice | None
 
+        # LWT values by device topic - applied after the loop, once all discovery configs registered their topic
+        lwt_values: dict[str, Any] = {}
+
         if msgs:
-            # first run for discovery...
+            # one pass, each topic split once and dispatched by its fixed segments
             for num, msg in enumerate(msgs, start=1):
                 if noisy:
-                    logger.debug(f"DIS [{num:03}] {msg.topic}\t[{type(msg.value)=}] {msg.value}")
-
-                if msg.topic.startswith(TASMOTA_DISCOVERY_TOPIC_BEGIN):
-                    maclookupkey: str = msg.topic[0 : msg.topic.rfind("/")]
-                    maclookupkey = maclookupkey[maclookupkey.rfind("/") + 1 :]
-
-                    td = tdlookup.get(maclookupkey)
-                    if noisy:
-                        logger.debug(f"LOOKUP [{msg.topic}] for {maclookupkey} GOT: {td=}")
-                    if td is None:
-                        td = TasmotaDevice()
-                        tdlookup[maclookupkey] = td
-                        ret.append(td)
-
-                    if msg.topic.endswith("config"):
-                        assert isinstance(msg.value, dict)
-                        td.tasmota_config = TasmotaDeviceConfig(**msg.value)
+                    logger.debug(f"MSG [{num:03}] {msg.topic}\t[{type(msg.value)=}] {msg.value}")
+
+                match msg.topic.split("/"):
+                    case ["tasmota", "discovery", *_, maclookupkey, ("config" | "sensors") as kind]:
+                        td = tdlookup.get(maclookupkey)
                         if noisy:
-                            logger.debug(
-                                get_pretty_dict_json_no_sort(
-                                    td.model_dump(
-                                        mode="python", exclude_none=False, exclude_defaults=False, by_alias=False
-                                    )
-                                )
-                            )
+                            logger.debug(f"LOOKUP [{msg.topic}] for {maclookupkey} GOT: {td=}")
+                        if td is None:
+                            td = TasmotaDevice()
+                            tdlookup[maclookupkey] = td
+                            ret.append(td)
+
+                        assert isinstance(msg.value, str)
+                        if kind == "config":
+                            td.tasmota_config = TasmotaDeviceConfig.from_payload(msg.value)
+                            assert td.tasmota_config.topic
+                            tdlookup[td.tasmota_config.topic] = td
+                        else:
+                            td.tasmota_sensors = parse_sensors(msg.value)
 
-                        assert td.tasmota_config.topic
-                        tdlookup[td.tasmota_config.topic] = td
-                    elif msg.topic.endswith("sensors"):
-                        assert isinstance(msg.value, dict)
-                        td.tasmota_sensors = TasmotaDeviceSensors(**msg.value)
                         if noisy:
                             logger.debug(
                                 get_pretty_dict_json_no_sort(
@@ -793,46 +1255,47 @@ class MqttCommander:
                                     )
                                 )
                             )
+                    case ["tele", mytopic, *_, "LWT"]:
+                        lwt_values[mytopic] = msg.value
 
-            # second run for LWT status
-            for num, msg in enumerate(msgs, start=1):
+            for mytopic, lwt_value in lwt_values.items():
+                td = tdlookup.get(mytopic)
                 if noisy:
-                    logger.debug(f"LWT [{num:03}] {msg.topic}\t[{type(msg.value)=}] {msg.value}")
-
-                if msg.topic.startswith(TASMOTA_LWT_TOPIC_BEGIN) and msg.topic.endswith(TASMOTA_LWT_TOPIC_END):
-                    mytopic: str = msg.topic.split("/")[1]
+                    logger.debug(f"LOOKUP [LWT] for {mytopic} GOT: {td=}")
 
-                    td = tdlookup.get(mytopic)
-                    if noisy:
-                        logger.debug(f"LOOKUP [{msg.topic}] for {mytopic} GOT: {td=}")
+                if td is None:
+                    td = TasmotaDevice()
+                    td.tasmota_config = TasmotaDeviceConfig()  # type: ignore
+                    td.tasmota_config.topic = mytopic
 
-                    if td is None:
-                        td = TasmotaDevice()
-                        td.tasmota_config = TasmotaDeviceConfig()  # type: ignore
-                        td.tasmota_config.topic = mytopic
+                    tdlookup[mytopic] = td
+                    ret.append(td)
 
-                        tdlookup[mytopic] = td
-                        ret.append(td)
-
-                    td.lwt_current_value = msg.value  # type: ignore
+                td.lwt_current_value = lwt_value
 
         return ret
 
     def filter_online_tasmotas_from_retained(
-        self, all_tasmotas: List[TasmotaDevice], update_lwt_current_value: bool = True
+        self,
+        all_tasmotas: List[TasmotaDevice],
+        update_lwt_current_value: bool = True,
+        retained_idle_timeout_ms: int | None = None,
     ) -> List[TasmotaDevice]:
         """Return only those devices from the list that are currently online.
 
         Args:
             all_tasmotas: Devices to filter.
             update_lwt_current_value: If True, update objects' LWT with current retained values.
+            retained_idle_timeout_ms: Passed on to :meth:`get_all_tasmota_devices_from_retained`.
 
         Returns:
             list[TasmotaDevice]: Online devices.
         """
         logger = self.__class__.logger
 
-        all_online_tasmotas: List[TasmotaDevice] = self.get_all_tasmota_devices_from_retained()
+        all_online_tasmotas: List[TasmotaDevice] = self.get_all_tasmota_devices_from_retained(
+            retained_idle_timeout_ms=retained_idle_timeout_ms
+        )
 
         online_topics: Dict[str, Literal["Online", "Offline"] | None] = {}
 
@@ -863,7 +1326,7 @@ def write_tasmota_devices_file(
     tasmotas: List[TasmotaDevice],
     fp: Path | None = None,
     noisy: bool = False,
-    timezone: tzinfo = pytz.timezone("Europe/Berlin"),
+    timezone: tzinfo = ZoneInfo("Europe/Berlin"),
 ) -> Path:
     """Write discovered devices to a timestamped JSON file.
 
@@ -886,24 +1349,14 @@ def write_tasmota_devices_file(
         now: datetime = datetime.now(tz=timezone)
         fp = Path(fp, f"tasmota_devices_{now:%d-%m-%Y_%H%M%S}.json")
 
-    with open(fp, "w") as fout:
-        fout.write("[\n")
-
+    if noisy:
         for num, tasmota in enumerate(tasmotas, start=1):
-            if num > 1:
-                fout.write(",\n")
-
-            outs: str = get_pretty_dict_json_no_sort(
-                tasmota.model_dump(mode="python", exclude_none=False, exclude_defaults=False, by_alias=False)
-            )
+            logger.debug(f"[{num}]\n{tasmota.model_dump_json(indent=2)}")
 
-            if noisy:
-                logger.debug(f"[{num}]\n{outs}")
-
-            fout.write(outs)
-
-        fout.write("\n]\n")
-        fout.flush()
+    # whole list serialized by pydantic-core in one go instead of one dump + JSON formatting per device
+    with open(fp, "wb") as fout:
+        fout.write(_TASMOTA_DEVICE_LIST_ADAPTER.dump_json(tasmotas, indent=2))
+        fout.write(b"\n")
 
     logger.info(f"TASMOTA DEVICES WRITTEN TO: {fp.resolve()}")
 
@@ -911,7 +1364,7 @@ def write_tasmota_devices_file(
 
 
 def read_tasmotas_from_latest_file(
-    tasmota_json_dir: Path | None = None, timezone: tzinfo = pytz.timezone("Europe/Berlin"), noisy: bool = False
+    tasmota_json_dir: Path | None = None, timezone: tzinfo = ZoneInfo("Europe/Berlin"), noisy: bool = False
 ) -> Optional[List[TasmotaDevice]]:
     """Read the most recent tasmota devices JSON file.
 
@@ -936,21 +1389,22 @@ def read_tasmotas_from_latest_file(
     if not tasmota_json_dir.exists():
         tasmota_json_dir.mkdir(parents=True)
 
-    jsonfiles: List[Path] = [fm for fm in tasmota_json_dir.glob("tasmota_devices_*json")]
-    jsonfiles = sorted(jsonfiles, key=lambda p: os.stat(p).st_mtime, reverse=True)
+    # scandir entries cache their stat() result -> one stat per file for sorting and logging
+    with os.scandir(tasmota_json_dir) as it:
+        jsonfiles: List[os.DirEntry[str]] = [
+            e for e in it if e.name.startswith("tasmota_devices_") and e.name.endswith("json") and e.is_file()
+        ]
+    jsonfiles.sort(key=lambda e: e.stat().st_mtime, reverse=True)
 
     for f in jsonfiles:
-        dateme: datetime = datetime.fromtimestamp(os.stat(f).st_mtime, tz=timezone)
-        logger.debug(f"{f.absolute()} -> {dateme}")
+        dateme: datetime = datetime.fromtimestamp(f.stat().st_mtime, tz=timezone)
+        logger.debug(f"{os.path.abspath(f.path)} -> {dateme}")
 
         json_data: List[Dict] | Dict | None = None
-        with open(f) as fin:
-            json_data = json.load(fin)
+        with open(f.path, "rb") as fin:
+            json_data = orjson.loads(fin.read())
 
         if json_data and type(json_data) is list:
-            ret: List[TasmotaDevice] = []
-            for td_dict in json_data:
-                tdm: TasmotaDevice = TasmotaDevice(**td_dict)
-                ret.append(tdm)
-            return ret
+            # whole list validated in one pydantic-core call instead of one TasmotaDevice(**...) per entry
+            return _TASMOTA_DEVICE_LIST_ADAPTER.validate_python(json_data)
     return None
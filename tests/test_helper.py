@@ -0,0 +1,58 @@
+import copy
+from typing import Any, Dict
+
+from mqttcommander.Helper import update_deep
+
+
+def test_update_deep_does_not_mutate_inputs() -> None:
+    base: Dict[str, Any] = {"a": {"x": 1, "l": [1, {"k": 1}]}, "b": 1}
+    u: Dict[str, Any] = {"a": {"y": 2, "l": [5]}, "c": [1, 2]}
+    base_before: Dict[str, Any] = copy.deepcopy(base)
+    u_before: Dict[str, Any] = copy.deepcopy(u)
+
+    merged = update_deep(base, u)
+
+    assert base == base_before
+    assert u == u_before
+    assert merged is not base
+
+
+def test_update_deep_flat_update_returns_new_dict() -> None:
+    base: Dict[str, Any] = {"a": 1}
+
+    merged = update_deep(base, {"b": 2})
+
+    assert merged == {"a": 1, "b": 2}
+    assert base == {"a": 1}
+
+
+def test_update_deep_nested_merge() -> None:
+    base: Dict[str, Any] = {"a": {"x": 1, "y": 2, "n": {"p": 1}}, "keep": {"z": 0}}
+
+    merged = update_deep(base, {"a": {"y": 3, "z": 4, "n": {"q": 2}}})
+
+    assert merged == {"a": {"x": 1, "y": 3, "z": 4, "n": {"p": 1, "q": 2}}, "keep": {"z": 0}}
+    # untouched subtrees are shared, not copied
+    assert isinstance(merged, dict) and merged["keep"] is base["keep"]
+
+
+def test_update_deep_list_takes_length_of_update() -> None:
+    assert update_deep([1, 2, 3], [9]) == [9]
+    assert update_deep([1], [7, 8]) == [7, 8]
+    assert update_deep([1, 2], []) == []
+    assert update_deep({"l": [1, 2, 3]}, {"l": [4]}) == {"l": [4]}
+
+
+def test_update_deep_list_merges_elements() -> None:
+    base: Dict[str, Any] = {"l": [{"a": 1, "b": 2}, [1, 2]]}
+
+    merged = update_deep(base, {"l": [{"b": 3}, [5]]})
+
+    assert merged == {"l": [{"a": 1, "b": 3}, [5]]}
+    assert base == {"l": [{"a": 1, "b": 2}, [1, 2]]}
+
+
+def test_update_deep_type_mismatch_replaces() -> None:
+    assert update_deep({"a": [1, 2]}, {"a": {"x": 1}}) == {"a": {"x": 1}}
+    assert update_deep({"a": {"x": 1}}, {"a": [1]}) == {"a": [1]}
+    assert update_deep([1, 2], {"x": 1}) == {"x": 1}
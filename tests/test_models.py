@@ -0,0 +1,147 @@
+import pytest
+from pydantic import ValidationError
+
+from mqttcommander.models import (
+    _DAYS_RE,
+    TasmotaDevice,
+    TasmotaDeviceConfig,
+    TasmotaTimerConfig,
+    TasmotaTimeZoneDSTSTD,
+    TasmotaTimezoneConfig,
+)
+
+
+@pytest.mark.parametrize("action", [0, 1, 2, 3])
+def test_timer_action_in_range(action: int) -> None:
+    timer: TasmotaTimerConfig = TasmotaTimerConfig.model_validate({"Action": action})
+
+    assert timer.action == action
+
+
+@pytest.mark.parametrize("action", [-1, 4])
+def test_timer_action_out_of_range(action: int) -> None:
+    with pytest.raises(ValidationError):
+        TasmotaTimerConfig.model_validate({"Action": action})
+
+
+def test_timer_full_payload() -> None:
+    # {"Timer1":{"Enable":1,"Mode":0,"Time":"22:00","Window":0,"Days":"1111111","Repeat":1,"Output":1,"Action":0}}
+    timer: TasmotaTimerConfig = TasmotaTimerConfig.model_validate_json(
+        '{"Enable":1,"Mode":0,"Time":"22:00","Window":0,"Days":"1111111","Repeat":1,"Output":1,"Action":0}'
+    )
+
+    assert (timer.enable, timer.mode, timer.window, timer.repeat, timer.output, timer.action) == (1, 0, 0, 1, 1, 0)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"Enable": 2}, {"Mode": 3}, {"Window": 16}, {"Repeat": -1}, {"Output": 0}, {"Output": 17}],
+)
+def test_timer_other_ranges(payload: dict) -> None:
+    with pytest.raises(ValidationError):
+        TasmotaTimerConfig.model_validate(payload)
+
+
+def test_device_config_timers_read_from_their_own_keys() -> None:
+    tdc: TasmotaDeviceConfig = TasmotaDeviceConfig.model_validate(
+        {f"Timer{num}": {"Enable": 1, "Output": num} for num in (1, 2, 3, 4)}
+    )
+
+    timers = (tdc.timer1, tdc.timer2, tdc.timer3, tdc.timer4)
+    assert [timer.output if timer else None for timer in timers] == [1, 2, 3, 4]
+
+
+def test_device_config_timer3_not_taken_from_timer2() -> None:
+    tdc: TasmotaDeviceConfig = TasmotaDeviceConfig.model_validate({"Timer2": {"Enable": 1, "Output": 2}})
+
+    assert tdc.timer2 is not None and tdc.timer3 is None
+
+
+@pytest.mark.parametrize("days", ["1111111", "0000000", "1-1-1-1", "-------", "0111110"])
+def test_days_mask_valid(days: str) -> None:
+    assert _DAYS_RE.fullmatch(days) is not None
+    assert TasmotaTimerConfig.model_validate({"Days": days}).days == days
+
+
+@pytest.mark.parametrize("days", ["", "111111", "11111111", "1111112", "SMTWTFS", "1111111\n", " 1111111"])
+def test_days_mask_invalid(days: str) -> None:
+    assert _DAYS_RE.fullmatch(days) is None
+
+    with pytest.raises(ValidationError):
+        TasmotaTimerConfig.model_validate({"Days": days})
+
+
+def test_device_is_online_follows_replaced_config() -> None:
+    td: TasmotaDevice = TasmotaDevice(tasmota_config=TasmotaDeviceConfig(online_msg="Up"), lwt_current_value="Online")
+    assert not td.is_online()
+
+    copied: TasmotaDevice = td.model_copy(update={"tasmota_config": TasmotaDeviceConfig(online_msg="Online")})
+    assert copied.is_online()
+
+    td.tasmota_config = TasmotaDeviceConfig(online_msg="Online")
+    assert td.is_online()
+
+
+def test_device_is_online_follows_config_changed_in_place() -> None:
+    tdc: TasmotaDeviceConfig = TasmotaDeviceConfig(online_msg="Up")
+    td: TasmotaDevice = TasmotaDevice(tasmota_config=tdc, lwt_current_value="Online")
+    assert not td.is_online()
+
+    tdc.online_msg = "Online"
+    assert td.is_online()
+
+
+def test_device_is_online_default_value() -> None:
+    assert TasmotaDevice(lwt_current_value="Online").is_online()
+    assert not TasmotaDevice(lwt_current_value="Offline").is_online()
+    assert TasmotaDevice(tasmota_config=TasmotaDeviceConfig(), lwt_current_value="Online").is_online()
+
+
+@pytest.mark.parametrize(
+    "mac, expected",
+    [
+        ("AABBCCDDEEFF", "AA:BB:CC:DD:EE:FF"),
+        # converted MACs come out upper-case
+        ("aabbccddeeff", "AA:BB:CC:DD:EE:FF"),
+        # colon-formatted ones are passed through as they are, whatever their length
+        ("aa:bb:cc:dd:ee:ff", "aa:bb:cc:dd:ee:ff"),
+        ("aa:bb:cc:dd:ee:ff:00:11", "aa:bb:cc:dd:ee:ff:00:11"),
+    ],
+)
+def test_mac_no_colon_to_colon(mac: str, expected: str) -> None:
+    assert TasmotaDeviceConfig.mac_no_colon_to_colon(mac) == expected
+
+
+@pytest.mark.parametrize("mac", ["AABBCCDDEEF", "AA BB CC DD EE FF", "AABBCCDDEEGG"])
+def test_mac_no_colon_to_colon_invalid(mac: str) -> None:
+    with pytest.raises(ValueError):
+        TasmotaDeviceConfig.mac_no_colon_to_colon(mac)
+
+
+def _tz_config(**overrides) -> TasmotaTimezoneConfig:
+    values: dict = {
+        "latitude": 52.5,
+        "longitude": 13.4,
+        "timedst": TasmotaTimeZoneDSTSTD.from_tasmota_command_string("0,0,3,1,2,120"),
+        "timestd": TasmotaTimeZoneDSTSTD.from_tasmota_command_string("0,0,10,1,3,60"),
+        "timezone": "99",
+    }
+    values.update(overrides)
+    return TasmotaTimezoneConfig(**values)
+
+
+def test_timezone_config_command_forms() -> None:
+    tzc: TasmotaTimezoneConfig = _tz_config()
+
+    assert tzc.as_tasmota_command_list() == [52.5, 13.4, "[0,0,3,1,2,120]", "[0,0,10,1,3,60]", "99"]
+    assert tzc.to_tasmota_command_string() == "[52.5,13.4,[0,0,3,1,2,120],[0,0,10,1,3,60],99]"
+
+
+@pytest.mark.parametrize("missing", ["latitude", "longitude", "timedst", "timestd", "timezone"])
+def test_timezone_config_incomplete(missing: str) -> None:
+    tzc: TasmotaTimezoneConfig = _tz_config(**{missing: None})
+
+    with pytest.raises(AssertionError):
+        tzc.as_tasmota_command_list()
+    with pytest.raises(AssertionError):
+        tzc.to_tasmota_command_string()
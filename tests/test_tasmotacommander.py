@@ -0,0 +1,294 @@
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Set, Tuple
+
+import pytest
+from paho.mqtt.client import CallbackAPIVersion, Client, MQTTMessage
+
+import mqttcommander.tasmotacommander as tasmotacommander
+from mqttcommander.models import TasmotaDevice, TasmotaDeviceConfig
+from mqttcommander.tasmotacommander import MqttCommander, _message_callbacks_added
+
+
+class _FakeMqttClient:
+    """Stands in for the ``MosquittoClientWrapper`` - apply_topic_filter never talks to a broker."""
+
+    def set_topics(self, topics: List[str]) -> None:
+        self.topics = topics
+
+
+def _commander(drop_filter: Any) -> MqttCommander:
+    return MqttCommander(msg_topicname_startwith_drop_filter=drop_filter, mqttclient=_FakeMqttClient())  # type: ignore
+
+
+def _msgs(*topics: str) -> List[Any]:
+    return [SimpleNamespace(topic=topic) for topic in topics]
+
+
+def test_apply_topic_filter_drops_prefixed_topics() -> None:
+    msgs: List[Any] = _msgs("tele/a/LWT", "tele/rtl_433/1", "stat/b/RESULT", "tele/rtl_433")
+
+    filtered = _commander({"tele/rtl_433"}).apply_topic_filter(msgs)
+
+    assert filtered is not None
+    assert [msg.topic for msg in filtered] == ["tele/a/LWT", "stat/b/RESULT"]
+
+
+def test_apply_topic_filter_keeps_each_message_once() -> None:
+    # messages used to be appended once per prefix they did not start with - duplicated, and leaked if dropped
+    msgs: List[Any] = _msgs("tele/x/LWT", "tele/y/LWT", "stat/z/RESULT")
+
+    filtered = _commander({"tele/x", "tele/q", "cmnd/"}).apply_topic_filter(msgs)
+
+    assert filtered is not None
+    assert [msg.topic for msg in filtered] == ["tele/y/LWT", "stat/z/RESULT"]
+    assert len({id(msg) for msg in filtered}) == len(filtered)
+
+
+def test_apply_topic_filter_all_dropped() -> None:
+    assert _commander({"tele/"}).apply_topic_filter(_msgs("tele/a/LWT", "tele/b/LWT")) is None
+
+
+def test_apply_topic_filter_empty_input() -> None:
+    commander: MqttCommander = _commander({"tele/"})
+
+    assert commander.apply_topic_filter(None) is None
+    assert commander.apply_topic_filter([]) is None
+
+
+def test_apply_topic_filter_without_filter() -> None:
+    msgs: List[Any] = _msgs("tele/rtl_433/1", "stat/b/RESULT")
+
+    assert _commander(None).apply_topic_filter(msgs) == msgs
+    assert _commander(None).apply_topic_filter([]) == []
+    assert _commander(set()).apply_topic_filter(msgs) == msgs
+
+
+def test_apply_topic_filter_follows_filter_changes() -> None:
+    msgs: List[Any] = _msgs("tele/a/LWT", "stat/b/RESULT")
+    commander: MqttCommander = _commander({"tele/"})
+
+    commander.msg_topicname_startwith_drop_filter.add("stat/")
+    assert commander.apply_topic_filter(msgs) is None
+
+    commander.msg_topicname_startwith_drop_filter = {"stat/"}
+    filtered = commander.apply_topic_filter(msgs)
+
+    assert filtered is not None
+    assert [msg.topic for msg in filtered] == ["tele/a/LWT"]
+
+
+def test_apply_topic_filter_default_drop_filter() -> None:
+    commander: MqttCommander = MqttCommander(mqttclient=_FakeMqttClient())  # type: ignore
+
+    filtered = commander.apply_topic_filter(_msgs("tele/rtl_433/1", "tele/a/LWT"))
+
+    assert filtered is not None
+    assert [msg.topic for msg in filtered] == ["tele/a/LWT"]
+
+
+def _paho_msg(topic: str, payload: bytes = b"{}") -> MQTTMessage:
+    msg: MQTTMessage = MQTTMessage(topic=topic.encode())
+    msg.payload = payload
+    return msg
+
+
+def test_message_callbacks_added_removes_only_own_callbacks() -> None:
+    client: Client = Client(CallbackAPIVersion.VERSION2)
+    seen: List[str] = []
+
+    def theirs(c: Client, userdata: Any, msg: MQTTMessage) -> None:
+        seen.append(f"theirs:{msg.topic}")
+
+    def ours(c: Client, userdata: Any, msg: MQTTMessage) -> None:
+        seen.append(f"ours:{msg.topic}")
+
+    client.message_callback_add("stat/+/RESULT", theirs)
+
+    with _message_callbacks_added(client, ["stat/+/RESULT", "stat/+/POWER", "stat/+/POWER"], ours):
+        client._handle_on_message(_paho_msg("stat/a/RESULT"))
+        client._handle_on_message(_paho_msg("stat/a/POWER"))
+
+    # the existing callback kept being called meanwhile and is the only one left afterwards
+    assert seen == ["ours:stat/a/RESULT", "theirs:stat/a/RESULT", "ours:stat/a/POWER"]
+    assert client._on_message_filtered["stat/+/RESULT"] is theirs
+    with pytest.raises(KeyError):
+        client._on_message_filtered["stat/+/POWER"]
+
+
+def test_message_callbacks_added_cleans_up_on_error() -> None:
+    client: Client = Client(CallbackAPIVersion.VERSION2)
+
+    def ours(c: Client, userdata: Any, msg: MQTTMessage) -> None:
+        pass
+
+    with pytest.raises(RuntimeError):
+        with _message_callbacks_added(client, ["stat/+/RESULT"], ours):
+            raise RuntimeError("response handler failed")
+
+    assert list(client._on_message_filtered.iter_match("stat/a/RESULT")) == []
+
+
+class _FakePublishInfo:
+    """Stands in for paho's ``MQTTMessageInfo``."""
+
+    def __init__(self, published: bool, error: Exception | None = None) -> None:
+        self.published = published
+        self.error = error
+
+    def wait_for_publish(self, timeout: float | None = None) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def is_published(self) -> bool:
+        return self.published
+
+
+class _FakePahoClient(Client):
+    """paho client that never connects: each publish is answered by the scripted device responses.
+
+    The responses are delivered from another thread, one after the other, like paho's network loop would.
+    """
+
+    def __init__(
+        self, responses: Dict[str, List[Tuple[str, bytes]]] | None = None, failing: Set[str] | None = None
+    ) -> None:
+        super().__init__(CallbackAPIVersion.VERSION2)
+        self.responses: Dict[str, List[Tuple[str, bytes]]] = responses or {}
+        self.failing: Set[str] = failing or set()
+        self.published: List[Tuple[str, Any]] = []
+        self.subscribed: List[str] = []
+        self.unsubscribed: List[str] = []
+        self.threads: List[threading.Thread] = []
+
+    def subscribe(self, topic: Any, *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        self.subscribed.extend(t for t, _ in topic)
+        return 0, 1
+
+    def unsubscribe(self, topic: Any, *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        self.unsubscribed.extend(topic)
+        return 0, 1
+
+    def publish(self, topic: str, payload: Any = None, *args: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        self.published.append((topic, payload))
+
+        if topic in self.failing:
+            return _FakePublishInfo(False, RuntimeError("not connected"))
+
+        def answer(responses: List[Tuple[str, bytes]]) -> None:
+            for stat_topic, resp in responses:
+                time.sleep(0.01)
+                self._handle_on_message(_paho_msg(stat_topic, resp))
+
+        thread: threading.Thread = threading.Thread(target=answer, args=(self.responses.get(topic, []),))
+        thread.start()
+        self.threads.append(thread)
+
+        return _FakePublishInfo(True)
+
+
+class _FakeConnectedMqttClient(_FakeMqttClient):
+    """Stands in for a connected ``MosquittoClientWrapper`` around a :class:`_FakePahoClient`."""
+
+    host: str = "broker"
+    port: int = 1883
+    username: str = "user"
+    password: str = "pass"
+
+    def __init__(self, client: _FakePahoClient) -> None:
+        self.client = client
+
+    def is_connected(self) -> bool:
+        return True
+
+
+def _device(topic: str) -> TasmotaDevice:
+    return TasmotaDevice(tasmota_config=TasmotaDeviceConfig(topic=topic, device_name=topic), lwt_current_value="Online")
+
+
+def _send(
+    client: _FakePahoClient, tasmotas: List[TasmotaDevice], cmds: List[str], values: Any = None
+) -> Tuple[List[TasmotaDevice], float]:
+    commander: MqttCommander = MqttCommander(mqttclient=_FakeConnectedMqttClient(client))  # type: ignore
+
+    started: float = time.monotonic()
+    ret: List[TasmotaDevice] = commander.send_cmds_to_online_tasmotas(
+        tasmotas, to_be_used_commands=cmds, values_to_send=values, noisy=False
+    )
+    elapsed: float = time.monotonic() - started
+
+    for thread in client.threads:
+        thread.join()
+
+    return ret, elapsed
+
+
+def test_publish_many_reports_failed_publishes() -> None:
+    client: _FakePahoClient = _FakePahoClient(failing={"cmnd/b/Power"})
+    commander: MqttCommander = MqttCommander(mqttclient=_FakeConnectedMqttClient(client))  # type: ignore
+
+    published: List[bool] = commander.publish_many([("cmnd/a/Power", {"x": 1}), ("cmnd/b/Power", "ON")])
+
+    assert published == [True, False]
+    assert client.published == [("cmnd/a/Power", '{"x": 1}'), ("cmnd/b/Power", "ON")]
+
+
+def test_send_cmds_device_timing_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tasmotacommander, "_CMD_RESPONSE_TIMEOUT_S", 0.3)
+    client: _FakePahoClient = _FakePahoClient(
+        responses={"cmnd/a/TELEPERIOD": [("stat/a/RESULT", b'{"TelePeriod":300}')]}
+    )
+    dev_a, dev_b = _device("a"), _device("b")
+
+    _, elapsed = _send(client, [dev_a, dev_b], ["TELEPERIOD"])
+
+    # the silent device is waited for until the timeout, the answering one is updated nonetheless
+    assert elapsed >= 0.3
+    assert dev_a.tasmota_config is not None and dev_a.tasmota_config.teleperiod == 300
+    assert dev_b.tasmota_config is not None and dev_b.tasmota_config.teleperiod is None
+
+    # per-run callbacks and subscriptions are taken off the shared session again
+    assert list(client._on_message_filtered.iter_match("stat/a/RESULT")) == []
+    assert set(client.unsubscribed) == set(client.subscribed)
+
+
+def test_send_cmds_failed_publish_not_waited_for(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tasmotacommander, "_CMD_RESPONSE_TIMEOUT_S", 5.0)
+    client: _FakePahoClient = _FakePahoClient(
+        responses={"cmnd/a/TELEPERIOD": [("stat/a/RESULT", b'{"TelePeriod":300}')]},
+        failing={"cmnd/b/TELEPERIOD"},
+    )
+    dev_a, dev_b = _device("a"), _device("b")
+
+    _, elapsed = _send(client, [dev_a, dev_b], ["TELEPERIOD"])
+
+    assert elapsed < 2.0
+    assert dev_a.tasmota_config is not None and dev_a.tasmota_config.teleperiod == 300
+    assert dev_b.tasmota_config is not None and dev_b.tasmota_config.teleperiod is None
+
+
+def test_send_cmds_backlog_collects_all_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tasmotacommander, "_CMD_RESPONSE_TIMEOUT_S", 5.0)
+    backlog: str = "Latitude 1.5; Longitude 2.5; TimeZone 99"
+    client: _FakePahoClient = _FakePahoClient(
+        responses={
+            "cmnd/a/Backlog": [
+                ("stat/a/RESULT", b'{"Latitude":1.5}'),
+                ("stat/other/RESULT", b""),  # not awaited - neither decoded nor counted
+                ("stat/a/RESULT", b'{"Longitude":2.5}'),
+                ("stat/a/RESULT", b'{"Timezone":99}'),
+            ]
+        }
+    )
+    dev_a: TasmotaDevice = _device("a")
+
+    _, elapsed = _send(client, [dev_a], ["Backlog"], values=[[backlog]])
+
+    assert elapsed < 2.0
+    assert client.published == [("cmnd/a/Backlog", backlog)]
+
+    assert dev_a.tasmota_config is not None
+    tzconfig = dev_a.tasmota_config.timezoneconfig
+    assert tzconfig is not None
+    assert (tzconfig.latitude, tzconfig.longitude, tzconfig.timezone) == (1.5, 2.5, "99")